@@ -0,0 +1,125 @@
+"""
+This is the array grid module. It contains the ArrayGrid class, a Grid stored in a numpy array, and the functions that
+check and apply a sequence of swaps to many grids at once.
+"""
+
+import numpy as np
+from grid import Grid, IllegalMove
+
+def swaps_to_cells(swap_list, m, n):
+    """
+    Returns the two arrays (a, b) of the flat indices of the cells of each swap of swap_list (format of Grid.swap_seq).
+    """
+    if len(swap_list) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    cells = np.asarray(swap_list, dtype=np.int64).reshape(-1, 2, 2)
+    return cells[:, 0, 0]*n + cells[:, 0, 1], cells[:, 1, 0]*n + cells[:, 1, 1]
+
+def legal_swaps(swap_list, m, n):
+    """
+    Vectorised legality check: returns the array of booleans telling for each swap of swap_list if its two cells are in
+    the m*n grid and adjacent.
+    """
+    if len(swap_list) == 0:
+        return np.empty(0, dtype=bool)
+    cells = np.asarray(swap_list, dtype=np.int64).reshape(-1, 2, 2)
+    inside = ((cells[:, :, 0] >= 0) & (cells[:, :, 0] < m) & (cells[:, :, 1] >= 0) & (cells[:, :, 1] < n)).all(axis=1)
+    return inside & (np.abs(cells[:, 0] - cells[:, 1]).sum(axis=1) == 1)
+
+def swap_permutation(swap_list, m, n):
+    """
+    Composes the swaps of swap_list into a single permutation perm of the cells: applying the swaps to a flattened state l
+    gives l[perm]. Raises IllegalMove if one of the swaps is not allowed.
+    """
+    if not legal_swaps(swap_list, m, n).all():
+        raise IllegalMove
+    perm = list(range(m*n)) # Liste Python : un échange d'éléments y coûte moins cher que dans un tableau numpy
+    for a, b in zip(*(x.tolist() for x in swaps_to_cells(swap_list, m, n))):
+        perm[a], perm[b] = perm[b], perm[a]
+    return np.array(perm, dtype=np.int64)
+
+def apply_batch(states, swap_list, m, n):
+    """
+    Applies the same sequence of swaps to N grids given as the rows of the (N, m*n) array states (flattened grids) and
+    returns the (N, m*n) array of the results. The swaps are composed once, then applied to all the grids in one gather.
+    """
+    return np.asarray(states)[:, swap_permutation(swap_list, m, n)]
+
+def verify_batch(states, swap_list, m, n):
+    """
+    Returns the array of booleans telling for each row of states (see apply_batch) if swap_list sorts it.
+    """
+    return (apply_batch(states, swap_list, m, n) == np.arange(1, m*n+1)).all(axis=1)
+
+class ArrayGrid(Grid):
+    """
+    A Grid stored in a flat numpy array of the m*n values. It has the same methods as Grid, state being an (m, n) view of
+    the array (state[i][j] reads and writes the array), with vectorised is_sorted and swap_seq.
+
+    Attributes:
+    -----------
+    cells: numpy.ndarray
+        The flattened state of the grid, cells[i*n+j] is the number in the cell (i, j)
+    """
+
+    def __init__(self, m, n, initial_state = []):
+        """
+        Initializes the grid from a list of lists (as Grid), a flattened list or an array. Default is the sorted grid.
+        """
+        self.m = m
+        self.n = n
+        if len(initial_state) == 0:
+            initial_state = np.arange(1, m*n+1)
+        self.state = initial_state
+
+    @property
+    def state(self):
+        return self.cells.reshape(self.m, self.n) # Vue, pas de copie
+
+    @state.setter
+    def state(self, state):
+        self.cells = np.array(state, dtype=np.int64).reshape(self.m*self.n)
+
+    def __str__(self):
+        output = f"The grid is in the following state:\n"
+        for i in range(self.m):
+            output += f"{self.state[i].tolist()}\n"
+        return output
+
+    def __repr__(self):
+        return f"<array_grid.ArrayGrid: m={self.m}, n={self.n}>"
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Returns the ArrayGrid with the same state as grid.
+        """
+        return cls(grid.m, grid.n, grid.flatten())
+
+    def is_sorted(self):
+        return bool((self.cells == np.arange(1, self.m*self.n+1)).all())
+
+    def swap(self, cell1, cell2):
+        if abs(cell1[0] - cell2[0]) + abs(cell1[1] - cell2[1]) == 1:
+            a, b = cell1[0]*self.n + cell1[1], cell2[0]*self.n + cell2[1]
+            self.cells[a], self.cells[b] = self.cells[b], self.cells[a]
+        else:
+            raise IllegalMove
+
+    def swap_seq(self, cell_pair_list):
+        """
+        Executes a sequence of swaps. All the swaps are checked at once: as with Grid.swap_seq, the swaps before the first
+        illegal one are done before IllegalMove is raised.
+        """
+        legal = legal_swaps(cell_pair_list, self.m, self.n)
+        if not legal.all():
+            first = int(np.argmin(legal))
+            self.cells = self.cells[swap_permutation(cell_pair_list[:first], self.m, self.n)]
+            raise IllegalMove
+        self.cells = self.cells[swap_permutation(cell_pair_list, self.m, self.n)]
+
+    def flatten(self):
+        return self.cells.tolist()
+
+    def copy(self):
+        return ArrayGrid(self.m, self.n, self.cells.copy())
@@ -0,0 +1,152 @@
+"""
+This is the batch module. It solves many grid files in parallel, one process per core, and writes the solutions as they
+are found.
+"""
+
+import os
+import glob
+import time
+import signal
+import contextlib
+import multiprocessing
+from grid import Grid
+from solver import Solver
+from cache import SolutionCache
+import heuristics
+
+class GridTimeout(Exception): # Levée dans un processus quand une grid dépasse le temps qui lui est alloué
+    pass
+
+def _solve_naive(solver, grid):
+    return solver.get_sol_naive(grid.copy())
+
+def _solve_constructive(solver, grid):
+    return solver.get_sol_constructive(grid.copy())
+
+def _solve_beam(solver, grid):
+    return solver.get_solution_beam(grid)
+
+def _solve_a_star(solver, grid):
+    return solver.get_solution(grid, heuristics.IncrementalHeuristic(grid.m, grid.n))
+
+def _solve_ida(solver, grid):
+    return solver.get_solution_ida(grid, heuristics.IncrementalHeuristic(grid.m, grid.n), tt_size=1000000)
+
+def _solve_bidir(solver, grid):
+    return solver.get_solution_bidir(grid)
+
+METHODS = {"naive": _solve_naive, "constructive": _solve_constructive, "beam": _solve_beam, "a_star": _solve_a_star, "ida": _solve_ida, "bidir": _solve_bidir}
+
+def expand_paths(pattern):
+    """
+    Returns the sorted list of the grid files designated by pattern: a directory (all its .in files) or a glob pattern.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.in")
+    return sorted(glob.glob(pattern))
+
+def write_solution(file_name, swap_list):
+    """
+    Writes a solution file: the first line contains the number of swaps, then each line contains a swap "i1 j1 i2 j2".
+    """
+    with open(file_name, "w") as file:
+        file.write(f"{len(swap_list)}\n")
+        for (i1, j1), (i2, j2) in swap_list:
+            file.write(f"{i1} {j1} {i2} {j2}\n")
+
+def read_solution(file_name):
+    """
+    Reads a solution file written by write_solution and returns the list of swaps.
+    """
+    with open(file_name, "r") as file:
+        nb_swaps = int(file.readline())
+        swap_list = []
+        for _ in range(nb_swaps):
+            i1, j1, i2, j2 = map(int, file.readline().split())
+            swap_list.append(((i1, j1), (i2, j2)))
+    return swap_list
+
+def _on_alarm(signum, frame):
+    raise GridTimeout
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """
+    Context manager that raises GridTimeout in its block once seconds (a float) have elapsed. Without limit (seconds
+    None) or without SIGALRM (Windows) the block is not interrupted. The previous handler of SIGALRM is restored.
+    """
+    if seconds is None or not hasattr(signal, "setitimer"):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def solve_file(file_name, method="ida", timeout=None, out_dir=None, table_dir=None, cache_file=None):
+    """
+    Solves one grid file and writes its solution (same name, extension .out) in out_dir, or next to the grid file if
+    out_dir is None. If cache_file is given, the solver uses the SolutionCache stored in this file (shared by the workers).
+
+    Output:
+    -------
+    summary: dict
+        The file name, the status ("ok", "timeout", "unsolved" or "error", with the exception in "message"), the number of
+        swaps, the number of states expanded and the wall time in seconds, plus the statistics of the cache (see
+        SolutionCache.stats) if one is used
+    """
+    summary = {"file": file_name, "status": "ok", "swaps": None, "nodes": 0, "time": 0.}
+    cache = SolutionCache(cache_file) if cache_file is not None else None
+    solver = Solver(table_dir, cache)
+    start = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            grid = Grid.grid_from_file(file_name)
+            swap_list = METHODS[method](solver, grid)
+    except GridTimeout:
+        summary["status"] = "timeout"
+        swap_list = None
+    except Exception as e:
+        summary["status"] = "error"
+        summary["message"] = repr(e)
+        swap_list = None
+    summary["time"] = time.perf_counter() - start
+    summary["nodes"] = solver.nodes_expanded
+    if cache is not None:
+        summary["cache"] = cache.stats()
+        cache.close()
+    if swap_list is None:
+        if summary["status"] == "ok":
+            summary["status"] = "unsolved"
+        return summary
+    summary["swaps"] = len(swap_list)
+    base = os.path.splitext(os.path.basename(file_name))[0] + ".out"
+    write_solution(os.path.join(out_dir if out_dir is not None else os.path.dirname(file_name), base), swap_list)
+    return summary
+
+def _solve_args(args):
+    return solve_file(*args)
+
+def solve_batch(paths, workers=None, method="ida", timeout=None, out_dir=None, table_dir=None, cache_file=None):
+    """
+    Solves the grid files of paths (a list of files, a directory or a glob pattern) with a pool of workers processes
+    (default: one per core). This is a generator: the summaries (see solve_file) are yielded as the grids are solved,
+    in the order in which they complete.
+    """
+    if isinstance(paths, str):
+        paths = expand_paths(paths)
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method}, expected one of {sorted(METHODS)}")
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    tasks = [(p, method, timeout, out_dir, table_dir, cache_file) for p in paths]
+    if workers == 1: # Pas de processus fils, pratique pour déboguer
+        for task in tasks:
+            yield _solve_args(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for summary in pool.imap_unordered(_solve_args, tasks, chunksize=1): # Une grid à la fois pour équilibrer la charge
+            yield summary
@@ -0,0 +1,226 @@
+"""
+This is the benchmark module. It runs a reproducible set of solver and graph benchmarks (seeded instances), writes the
+measures as JSON and compares them with a stored baseline, for instance from the root folder:
+
+    python swap_puzzle/benchmark.py --out bench.json
+    python swap_puzzle/benchmark.py --out new.json --compare bench.json
+
+For each run the wall time (best of repeat runs), the number of nodes expanded per second, the peak memory (measured
+with tracemalloc, in a separate run so that it does not slow down the timed ones) and the length of the solution are
+recorded. The comparison flags the runs that became slower, used more memory or found longer solutions. The startup time
+is measured as well: the time of a new interpreter that imports the modules of a plain solve.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import subprocess
+import tracemalloc
+from grid import Grid
+from graph import Graph, CSRGraph
+from solver import Solver
+import heuristics
+from search_stats import SearchStats
+from batch import GridTimeout, time_limit
+
+HEURISTICS = {"manhattan": lambda m, n: heuristics.manhattan_distance,
+              "supnorm": lambda m, n: heuristics.supnorm,
+              "maxswap": lambda m, n: heuristics.maxswap_h,
+              "hash": lambda m, n: heuristics.hash_h,
+              "incremental": heuristics.IncrementalHeuristic}
+
+SHAPES = [(2, 2), (2, 3), (3, 2), (3, 3), (2, 4)]
+QUICK_SHAPES = [(2, 2), (2, 3)]
+GRAPHS = [(1000, 5000), (100000, 500000)] # (nombre de sommets, nombre d'arêtes)
+QUICK_GRAPHS = [(1000, 5000)]
+IMPORTS = ["grid", "solver"] # Modules chargés par un solve simple : ni numpy ni matplotlib ne doivent en faire partie
+
+def default_cases(quick=False, seeds=(0, 1)):
+    """
+    Returns the list of the benchmark cases: get_sol_naive and get_solution with each heuristic of HEURISTICS on seeded
+    grids of each shape and difficulty (see Grid.generate_grid), Graph.bfs and CSRGraph.bfs on seeded random graphs, and
+    the import of the modules of IMPORTS. Each case is a dict of the parameters of run_case, its "name" identifies it in
+    the comparisons.
+    """
+    cases = [{"name": "import/" + "+".join(IMPORTS), "kind": "import", "modules": IMPORTS}]
+    for m, n in QUICK_SHAPES if quick else SHAPES:
+        for difficulty in (1, 2, 3):
+            for seed in seeds:
+                grid = {"m": m, "n": n, "difficulty": difficulty, "seed": seed}
+                cases.append({"name": f"naive/{m}x{n}/d{difficulty}/s{seed}", "kind": "naive", **grid})
+                for h in HEURISTICS:
+                    cases.append({"name": f"a_star-{h}/{m}x{n}/d{difficulty}/s{seed}", "kind": "a_star", "heuristic": h,
+                                  **grid})
+    for nb_nodes, nb_edges in QUICK_GRAPHS if quick else GRAPHS:
+        for kind in ("bfs", "csr_bfs"):
+            cases.append({"name": f"{kind}/{nb_nodes}-{nb_edges}/s0", "kind": kind, "nb_nodes": nb_nodes,
+                          "nb_edges": nb_edges, "seed": 0})
+    return cases
+
+def make_grid(m, n, difficulty, seed):
+    """
+    Returns the grid generated by Grid.generate_grid with the given difficulty, random being seeded with seed.
+    """
+    random.seed(seed)
+    grid = Grid(m, n)
+    grid.generate_grid(difficulty)
+    return grid
+
+def make_edges(nb_nodes, nb_edges, seed):
+    """
+    Returns the edges of a seeded random connected graph on the nodes 1..nb_nodes: a random tree, then random edges.
+    """
+    rng = random.Random(seed)
+    edges = [(rng.randint(1, v-1), v) for v in range(2, nb_nodes+1)]
+    edges += [(rng.randint(1, nb_nodes), rng.randint(1, nb_nodes)) for _ in range(nb_edges - len(edges))]
+    return edges
+
+def _prepare(case):
+    """
+    Builds the instance of a case (outside of the measures) and returns the function that runs it. This function
+    returns the length of the solution (None if there is none) and the number of nodes expanded.
+    """
+    kind = case["kind"]
+    if kind == "import": # Nouvel interpréteur : les modules déjà chargés ici ne comptent pas
+        command = [sys.executable, "-c", "import " + ", ".join(case["modules"])]
+        directory = os.path.dirname(os.path.abspath(__file__))
+        def run():
+            subprocess.run(command, cwd=directory, check=True)
+            return None, None
+        return run
+    if kind in ("naive", "a_star"):
+        grid = make_grid(case["m"], case["n"], case["difficulty"], case["seed"])
+        solver = Solver()
+        if kind == "naive":
+            def run():
+                swap_list = solver.get_sol_naive(grid.copy())
+                return len(swap_list), solver.nodes_expanded
+        else:
+            h = HEURISTICS[case["heuristic"]](grid.m, grid.n)
+            def run():
+                swap_list = solver.get_solution(grid, h)
+                return len(swap_list), solver.nodes_expanded
+        return run
+    edges = make_edges(case["nb_nodes"], case["nb_edges"], case["seed"])
+    graph = Graph(range(1, case["nb_nodes"]+1))
+    for node1, node2 in edges:
+        graph.add_edge(node1, node2)
+    if kind == "csr_bfs":
+        graph = CSRGraph.from_graph(graph)
+    def run():
+        stats = SearchStats()
+        path = graph.bfs(1, case["nb_nodes"], stats)
+        return (len(path)-1 if path is not None else None), stats.expanded
+    return run
+
+def run_case(case, repeat=3, timeout=10.):
+    """
+    Runs a case repeat times and once more under tracemalloc (except the import cases, whose memory is not in this
+    process), each run being stopped after timeout seconds (if the platform has SIGALRM). Returns the dict of the case
+    completed with the measures: "status" ("ok", "timeout" or "error"), "time" (best wall time in seconds), "nodes",
+    "nodes_per_s", "peak_bytes" and "length".
+    """
+    result = dict(case)
+    result.update({"status": "ok", "time": None, "nodes": None, "nodes_per_s": None, "peak_bytes": None, "length": None})
+    try:
+        run = _prepare(case)
+        times = []
+        for _ in range(repeat):
+            with time_limit(timeout):
+                start = time.perf_counter()
+                length, nodes = run()
+                times.append(time.perf_counter() - start)
+        peak = None
+        if case["kind"] != "import":
+            with time_limit(10*timeout if timeout is not None else None): # tracemalloc ralentit nettement l'exécution
+                tracemalloc.start()
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+    except GridTimeout:
+        result["status"] = "timeout"
+        return result
+    except Exception as e:
+        result["status"] = "error"
+        result["message"] = repr(e)
+        return result
+    finally:
+        tracemalloc.stop()
+    best = min(times)
+    result.update({"time": best, "nodes": nodes, "nodes_per_s": nodes/best if nodes is not None and best > 0 else None, "peak_bytes": peak,
+                   "length": length})
+    return result
+
+def run_benchmarks(cases, repeat=3, timeout=10., progress=None):
+    """
+    Runs all the cases and returns the report: {"meta": {...}, "results": [...]}. progress is called with each result
+    as soon as it is measured.
+    """
+    import numpy
+    meta = {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "system": platform.system(), "numpy": numpy.__version__,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": repeat, "timeout": timeout}
+    results = []
+    for case in cases:
+        results.append(run_case(case, repeat, timeout))
+        if progress is not None:
+            progress(results[-1])
+    return {"meta": meta, "results": results}
+
+def compare(baseline, current, threshold=0.25, min_time=1e-3):
+    """
+    Compares two reports and returns the list of the regressions of current, as dicts {"name", "metric", "baseline",
+    "current"}: a run that times out or fails when it did not, a longer solution, or a time or a peak memory more than
+    threshold (relative) above the baseline. The times below min_time seconds are too noisy and are not compared.
+    """
+    old = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = old.get(r["name"])
+        if b is None or b["status"] != "ok":
+            continue
+        if r["status"] != "ok":
+            regressions.append({"name": r["name"], "metric": "status", "baseline": b["status"], "current": r["status"]})
+            continue
+        if b["length"] is not None and (r["length"] is None or r["length"] > b["length"]):
+            regressions.append({"name": r["name"], "metric": "length", "baseline": b["length"], "current": r["length"]})
+        if max(b["time"], r["time"]) >= min_time and r["time"] > (1 + threshold)*b["time"]:
+            regressions.append({"name": r["name"], "metric": "time", "baseline": b["time"], "current": r["time"]})
+        if b["peak_bytes"] is not None and r["peak_bytes"] > (1 + threshold)*b["peak_bytes"]:
+            regressions.append({"name": r["name"], "metric": "peak_bytes", "baseline": b["peak_bytes"],
+                                "current": r["peak_bytes"]})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the swap puzzle benchmarks.")
+    parser.add_argument("--out", default=None, help="JSON file of the results (default: printed)")
+    parser.add_argument("--compare", default=None, help="baseline JSON file: exit status 1 if a run regressed")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown flagged as a regression")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (the best one is kept)")
+    parser.add_argument("--timeout", type=float, default=10., help="time limit per run, in seconds")
+    parser.add_argument("--quick", action="store_true", help="small shapes and graphs only")
+    parser.add_argument("--filter", default=None, help="only the cases whose name contains this string")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in default_cases(args.quick) if args.filter is None or args.filter in c["name"]]
+    def progress(result):
+        print(f"{result['name']}: {result['status']} time={result['time']} length={result['length']}", file=sys.stderr)
+    report = run_benchmarks(cases, args.repeat, args.timeout, progress)
+    if args.out is not None:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=1)
+    else:
+        print(json.dumps(report, indent=1))
+    if args.compare is None:
+        return 0
+    with open(args.compare) as file:
+        regressions = compare(json.load(file), report, args.threshold)
+    for r in regressions:
+        print(f"regression: {r['name']} {r['metric']} {r['baseline']} -> {r['current']}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
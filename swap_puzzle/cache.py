@@ -0,0 +1,161 @@
+"""
+This is the cache module. It contains the SolutionCache class, a persistent store of the exact distances and optimal next
+moves learned by the solvers, shared between solves (and between processes through the database file).
+"""
+
+import sqlite3
+from array import array
+from symmetry import get_symmetries
+
+def _blob(codec, key): # Clé du codec "packed" (bytes, ou tuple pour les grandes grids) -> bytes pour sqlite
+    shape = array("H", (codec.m, codec.n)).tobytes() # La forme fait partie de la clé : une grid 2*3 n'est pas une grid 3*2
+    if isinstance(key, bytes):
+        return shape + key
+    return shape + array("H", key).tobytes()
+
+class SolutionCache():
+    """
+    A size-bounded cache of exact results, stored in a SQLite database. For each state it keeps the exact number of swaps
+    needed to sort it and the index (in codec.edges) of an optimal next swap, -1 for the sorted grid. States are given as
+    keys of the codec "packed" of their shape (all methods take this codec as first argument). When the cache holds more
+    than max_entries states, the least recently used ones are evicted. If symmetric is True, a state and its images by
+    the symmetries of the grid (see symmetry.py) share a single entry, stored for their canonical representative.
+
+    Attributes:
+    -----------
+    file_name: str
+        The database file, ":memory:" for a cache that only lives in the current process
+    max_entries: int
+        The maximal number of states kept
+    hits: int
+        The number of lookups that found the state
+    misses: int
+        The number of lookups that did not find the state
+    touched: dict[bytes, int]
+        The last use of the states found since the last write, kept in memory so that the lookups do not hold a write
+        lock on the database (see flush)
+    symmetric: bool
+        Whether the states are stored up to the symmetries of the grid
+    """
+
+    def __init__(self, file_name=":memory:", max_entries=1000000, symmetric=True):
+        self.file_name = file_name
+        self.max_entries = max_entries
+        self.symmetric = symmetric
+        self.hits = 0
+        self.misses = 0
+        self.touched = {}
+        self.db = sqlite3.connect(file_name)
+        self.db.execute("CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, dist INTEGER, move INTEGER, used INTEGER)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_used ON cache (used)")
+        self.clock = self.db.execute("SELECT COALESCE(MAX(used), 0) FROM cache").fetchone()[0] # Horloge pour le LRU
+
+    def __repr__(self):
+        return f"<cache.SolutionCache: file_name={self.file_name}, entries={len(self)}>"
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, codec, key):
+        """
+        Returns the pair (dist, move) stored for the state key, None if the state is not in the cache.
+        """
+        key, t = self.canonical(codec, key)
+        blob = _blob(codec, key)
+        row = self.db.execute("SELECT dist, move FROM cache WHERE key = ?", (blob,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clock += 1
+        self.touched[blob] = self.clock # Écrit plus tard : un UPDATE ouvrirait une transaction jusqu'au prochain commit
+        dist, move = row
+        if t != 0 and move >= 0: # Le coup est stocké pour le représentant canonique
+            move = get_symmetries(codec.m, codec.n).edge_maps[t][move]
+        return dist, move
+
+    def put(self, codec, key, dist, move):
+        """
+        Stores the exact distance dist of the state key and an optimal next move.
+        """
+        key, t = self.canonical(codec, key)
+        if t != 0 and move >= 0:
+            move = get_symmetries(codec.m, codec.n).edge_maps[t][move]
+        self.clock += 1
+        self.db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (_blob(codec, key), dist, move, self.clock))
+
+    def put_solution(self, codec, key, moves):
+        """
+        Stores all the states of an optimal solution: starting from the state key, moves is the list of the indices of
+        the swaps of the solution. Each state along the way gets its distance and next move.
+        """
+        l = codec.decode(key)
+        for i, k in enumerate(moves):
+            self.put(codec, codec.encode(l), len(moves)-i, k)
+            a, b = codec.edges[k]
+            l[a], l[b] = l[b], l[a]
+        self.put(codec, codec.encode(l), 0, -1)
+        self.flush()
+
+    def flush(self):
+        """
+        Writes the last use of the states found by get (for the eviction of the least recently used states), evicts the
+        extra states and commits, in one short transaction.
+        """
+        if self.touched:
+            self.db.executemany("UPDATE cache SET used = MAX(used, ?) WHERE key = ?",
+                                [(used, blob) for blob, used in self.touched.items()])
+            self.touched = {}
+        self.evict()
+        self.db.commit()
+
+    def get_solution(self, codec, key):
+        """
+        Returns the list of the indices of an optimal solution from the state key by following the cached next moves, None
+        if the state or one of the following states is not in the cache.
+        """
+        row = self.get(codec, key)
+        if row is None:
+            return None
+        l = codec.decode(key)
+        moves = []
+        while row[0] > 0:
+            k = row[1]
+            moves.append(k)
+            a, b = codec.edges[k]
+            l[a], l[b] = l[b], l[a]
+            row = self.get(codec, codec.encode(l))
+            if row is None:
+                return None
+        return moves
+
+    def canonical(self, codec, key):
+        """
+        Returns the key under which the state key is stored and the symmetry that maps the state onto it (0, the
+        identity, if the cache is not symmetric).
+        """
+        if not self.symmetric:
+            return key, 0
+        return get_symmetries(codec.m, codec.n).canonical(codec, key)
+
+    def evict(self):
+        """
+        Removes the least recently used states until at most max_entries remain.
+        """
+        extra = len(self) - self.max_entries
+        if extra > 0:
+            self.db.execute("DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used LIMIT ?)", (extra,))
+
+    def stats(self):
+        """
+        Returns the number of entries, hits and misses, the hit rate and the size of the database in bytes.
+        """
+        lookups = self.hits + self.misses
+        page_size = self.db.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.db.execute("PRAGMA page_count").fetchone()[0]
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits/lookups if lookups else 0., "size_bytes": page_size*page_count}
+
+    def close(self):
+        self.flush()
+        self.db.close()
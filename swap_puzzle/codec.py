@@ -0,0 +1,191 @@
+"""
+This is the codec module. It contains the state codecs used to turn the state of a grid into a hashable key and back.
+"""
+
+import math
+
+class StateCodec():
+    """
+    A base class for the codecs of the states of a m*n grid. A state is given as the flattened grid (list of the m*n values,
+    line by line, as returned by Grid.flatten) and is encoded into a key. Encoding and decoding are exact and cost O(m*n).
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    size: int
+        Number of cells in the grid (m*n)
+    edges: list[tuple[int]]
+        The pairs (a, b) of flat indices of adjacent cells, each pair listed once with a < b. The index of a pair in this
+        list is the index of the corresponding move.
+    swaps: list[tuple[tuple[int]]]
+        The same moves in the format of Grid.swap, swaps[k] = ((i1, j1), (i2, j2)).
+    swap_index: dict
+        The inverse of swaps, swap_index[swaps[k]] = k
+    """
+
+    name = None
+
+    def __init__(self, m, n):
+        """
+        Initializes the codec for grids of shape m*n.
+        """
+        self.m = m
+        self.n = n
+        self.size = m*n
+        self.edges = []
+        for a in range(m*n): # Chaque arête n'est énumérée qu'une fois : vers la droite puis vers le bas
+            i, j = divmod(a, n)
+            if j < n-1:
+                self.edges.append((a, a+1))
+            if i < m-1:
+                self.edges.append((a, a+n))
+        self.swaps = [((a//n, a%n), (b//n, b%n)) for a, b in self.edges]
+        self.swap_index = {swap: k for k, swap in enumerate(self.swaps)}
+
+    def __repr__(self):
+        """
+        Returns a representation of the codec with the shape of the grids it encodes.
+        """
+        return f"<codec.{type(self).__name__}: m={self.m}, n={self.n}>"
+
+    def encode(self, l):
+        """
+        Encodes a flattened state l (list of m*n integers) into a key.
+        """
+        raise NotImplementedError
+
+    def decode(self, key):
+        """
+        Decodes a key into the flattened state (list of m*n integers).
+        """
+        raise NotImplementedError
+
+    def goal(self):
+        """
+        Returns the key of the sorted grid.
+        """
+        return self.encode(list(range(1, self.size+1)))
+
+    def neighbours(self, key):
+        """
+        Returns the states reachable from key with one swap, as a list of pairs (neighbour_key, k) where k is the index of
+        the move in self.edges (the swap itself is self.swaps[k]). Each adjacent pair of cells gives exactly one neighbour.
+        """
+        l = self.decode(key)
+        neighbours = []
+        for k, (a, b) in enumerate(self.edges):
+            l[a], l[b] = l[b], l[a]
+            neighbours.append((self.encode(l), k))
+            l[a], l[b] = l[b], l[a]
+        return neighbours
+
+class BaseCodec(StateCodec):
+    """
+    Positional codec: the state is seen as a number in base m*n+1 whose i-th digit is l[i] (the least significant digit is
+    the cell (0, 0)). It is the historical Grid.id encoding, decoded with integer operations only.
+    """
+
+    name = "base"
+
+    def __init__(self, m, n):
+        super().__init__(m, n)
+        self.base = m*n+1
+        powers = [self.base**i for i in range(m*n)]
+        self.deltas = [powers[a] - powers[b] for a, b in self.edges] # Échanger les chiffres a et b ajoute (l[b]-l[a])*deltas[k]
+
+    def encode(self, l):
+        key = 0
+        base = self.base
+        for v in reversed(l): # Schéma de Horner, pas de puissances recalculées
+            key = key*base + v
+        return key
+
+    def decode(self, key):
+        l = []
+        base = self.base
+        for _ in range(self.size):
+            key, r = divmod(key, base) # Division entière exacte, plus de flottants
+            l.append(r)
+        return l
+
+    def neighbours(self, key):
+        l = self.decode(key) # Un seul décodage, ensuite chaque voisin coûte une multiplication et une addition
+        return [(key + (l[b]-l[a])*self.deltas[k], k) for k, (a, b) in enumerate(self.edges)]
+
+class RankCodec(StateCodec):
+    """
+    Permutation rank codec: the state is mapped to an integer of 0..(m*n)!-1, so keys can index dense arrays (one entry per
+    state). We use the linear-time ranking of Myrvold and Ruskey, a variant of the Lehmer code that avoids the O((m*n)²)
+    inversion counting of the lexicographic rank.
+    """
+
+    name = "rank"
+
+    def __init__(self, m, n):
+        super().__init__(m, n)
+        self.nb_states = math.factorial(m*n) # Les rangs sont exactement 0..nb_states-1
+
+    def encode(self, l):
+        N = self.size
+        p = [v-1 for v in l] # Les valeurs 1..N deviennent 0..N-1
+        q = [0]*N            # Permutation inverse
+        for i in range(N):
+            q[p[i]] = i
+        r = 0
+        mult = 1
+        for k in range(N, 1, -1):
+            s = p[k-1]
+            j = q[k-1]
+            p[k-1], p[j] = p[j], p[k-1]
+            q[s], q[k-1] = q[k-1], q[s]
+            r += s*mult
+            mult *= k
+        return r
+
+    def decode(self, key):
+        N = self.size
+        p = list(range(N))
+        for k in range(N, 0, -1):
+            key, r = divmod(key, k)
+            p[k-1], p[r] = p[r], p[k-1]
+        return [v+1 for v in p]
+
+class PackedCodec(StateCodec):
+    """
+    Packed codec: the state is stored as bytes (one byte per cell) or as a tuple when the grid has more than 255 cells.
+    It is the cheapest key to hash and to compare.
+    """
+
+    name = "packed"
+
+    def encode(self, l):
+        if self.size < 256:
+            return bytes(l)
+        return tuple(l)
+
+    def decode(self, key):
+        return list(key)
+
+    def neighbours(self, key):
+        l = bytearray(key) if self.size < 256 else list(key)
+        pack = bytes if self.size < 256 else tuple
+        neighbours = []
+        for k, (a, b) in enumerate(self.edges):
+            l[a], l[b] = l[b], l[a]
+            neighbours.append((pack(l), k))
+            l[a], l[b] = l[b], l[a]
+        return neighbours
+
+CODECS = {c.name: c for c in (BaseCodec, RankCodec, PackedCodec)}
+_codecs = {} # Les codecs sont sans état propre à une grille, on n'en garde qu'un par forme
+
+def get_codec(m, n, kind="base"):
+    """
+    Returns the codec of the given kind ("base", "rank" or "packed") for grids of shape m*n.
+    """
+    if (kind, m, n) not in _codecs:
+        _codecs[(kind, m, n)] = CODECS[kind](m, n)
+    return _codecs[(kind, m, n)]
@@ -0,0 +1,161 @@
+"""
+This is the distance table module. It contains the DistanceTable class, which stores the exact distance to the sorted grid
+of every state of a small grid, indexed by permutation rank.
+"""
+
+import os
+import sys
+import numpy as np
+from codec import get_codec
+
+UNREACHED = 255 # Distance des états pas encore atteints pendant la construction
+
+def unrank_array(ranks, N):
+    """
+    Vectorised RankCodec.decode: returns the (len(ranks), N) array of the states (values 0..N-1) of the given ranks.
+    """
+    ranks = ranks.copy()
+    rows = np.arange(len(ranks))
+    p = np.tile(np.arange(N, dtype=np.int8), (len(ranks), 1))
+    for k in range(N, 0, -1):
+        r = ranks % k
+        ranks //= k
+        buff = p[:, k-1].copy()
+        p[:, k-1] = p[rows, r]
+        p[rows, r] = buff
+    return p
+
+def rank_array(p):
+    """
+    Vectorised RankCodec.encode: returns the ranks of the states (values 0..N-1) given as the rows of p.
+    """
+    F, N = p.shape
+    p = p.astype(np.int64)
+    rows = np.arange(F)
+    q = np.empty_like(p) # Permutations inverses
+    q[rows[:, None], p] = np.arange(N)
+    r = np.zeros(F, dtype=np.int64)
+    mult = 1
+    for k in range(N, 1, -1):
+        s = p[:, k-1].copy()
+        j = q[:, k-1].copy()
+        p[rows, j] = s # p[k-1] ne sert plus, seul p[j] change
+        q[rows, s] = j
+        r += s*mult
+        mult *= k
+    return r
+
+class DistanceTable():
+    """
+    A table of the exact distances to the sorted grid of all the (m*n)! states of a m*n grid.
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    codec: RankCodec
+        The codec giving the rank of a state, i.e. its index in dist
+    dist: numpy.ndarray
+        Array of uint8 such that dist[r] is the minimal number of swaps needed to sort the state of rank r
+    """
+
+    def __init__(self, m, n, dist):
+        """
+        Initializes the table from an already computed array of distances.
+        """
+        self.m = m
+        self.n = n
+        self.codec = get_codec(m, n, "rank")
+        if len(dist) != self.codec.nb_states:
+            raise Exception("Format incorrect")
+        self.dist = dist
+
+    def __repr__(self):
+        """
+        Returns a representation of the table with the shape of the grid and the maximal distance.
+        """
+        return f"<distance_table.DistanceTable: m={self.m}, n={self.n}, max_dist={int(self.dist.max())}>"
+
+    @classmethod
+    def build(cls, m, n):
+        """
+        Computes the table by a single BFS from the sorted grid. The BFS goes level by level and each level is handled as
+        a whole with numpy (unrank the frontier, apply each swap to all of it, rank the results).
+        """
+        codec = get_codec(m, n, "rank")
+        N = m*n
+        dist = np.full(codec.nb_states, UNREACHED, dtype=np.uint8)
+        frontier = np.array([codec.goal()], dtype=np.int64)
+        dist[frontier] = 0
+        d = 0
+        while len(frontier) > 0:
+            d += 1
+            states = unrank_array(frontier, N)
+            next_frontier = []
+            for a, b in codec.edges:
+                states[:, [a, b]] = states[:, [b, a]]
+                ne = rank_array(states)
+                next_frontier.append(ne[dist[ne] == UNREACHED])
+                states[:, [a, b]] = states[:, [b, a]]
+            frontier = np.unique(np.concatenate(next_frontier))
+            dist[frontier] = d
+        return cls(m, n, dist)
+
+    def save(self, file_name):
+        """
+        Saves the table in the .npy format (the shape is recovered from the number of states when loading).
+        """
+        np.save(file_name, self.dist)
+
+    @classmethod
+    def load(cls, file_name, m, n):
+        """
+        Loads a table saved with save. The file is memory-mapped, so only the pages that are read are loaded.
+        """
+        return cls(m, n, np.load(file_name, mmap_mode="r"))
+
+    def distance(self, grid):
+        """
+        Returns the minimal number of swaps needed to sort the grid.
+        """
+        return int(self.dist[self.codec.encode(grid.flatten())])
+
+    def get_solution(self, grid):
+        """
+        Returns an optimal list of swaps sorting the grid, without any search: from each state we go to a neighbour whose
+        distance is one less, which costs one line of the table per swap of the solution. The ranks of the neighbours of a
+        state are computed together with rank_array, so each step only makes O(m*n) numpy operations. A ValueError is
+        raised if no neighbour is one swap closer, which only happens with a corrupted table.
+        """
+        codec = self.codec
+        a, b = np.array(codec.edges).T
+        moves = np.tile(np.arange(codec.size), (len(codec.edges), 1)) # moves[k] permute les cases a[k] et b[k]
+        rows = np.arange(len(codec.edges))
+        moves[rows, a], moves[rows, b] = b, a
+        state = np.array(grid.flatten(), dtype=np.int64) - 1
+        d = int(self.dist[codec.encode(grid.flatten())])
+        swap_list = []
+        while d > 0:
+            neighbours = state[moves] # Une ligne par voisin
+            closer = np.flatnonzero(self.dist[rank_array(neighbours)] == d-1)
+            if len(closer) == 0:
+                raise ValueError(f"Corrupted distance table: no neighbour at distance {d-1}")
+            k = closer[0]
+            swap_list.append(codec.swaps[k])
+            state, d = neighbours[k], d-1
+        return swap_list
+
+def table_file(table_dir, m, n):
+    """
+    Returns the name of the file of the table of the m*n grids in the directory table_dir.
+    """
+    return os.path.join(table_dir, f"table_{m}x{n}.npy")
+
+if __name__ == "__main__": # Précalcul : python swap_puzzle/distance_table.py m n dossier
+    m, n, table_dir = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+    os.makedirs(table_dir, exist_ok=True)
+    table = DistanceTable.build(m, n)
+    table.save(table_file(table_dir, m, n))
+    print(table)
@@ -0,0 +1,174 @@
+"""
+This is the generator module. It generates grids whose distance to the sorted grid (the minimal number of swaps) is
+known and lies in a requested band, unlike Grid.generate_grid whose difficulty does not bound the distance. The
+generation is seeded, and the corpora are streamed to grid files or to a binary corpus file (see loaders.py), for
+instance from the root folder:
+
+    python swap_puzzle/generator.py 3 3 --distance 8 --count 1000 --seed 0 --out-dir corpus/
+    python swap_puzzle/generator.py 4 4 --distance 10 --max-distance 12 --count 100000 --binary corpus_4x4.bin
+
+Two methods are used:
+- when a distance table of the shape is available (see distance_table.py), the grids are drawn uniformly among the
+  states of the table whose distance is in the band
+- otherwise a random walk of L swaps from the sorted grid gives a grid at distance at most L, which is checked against
+  the exact distance (A* with an admissible heuristic, skipped when the heuristic already equals L); L is adjusted after
+  each grid to stay in the band
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+from codec import get_codec
+from graph import Graph
+from heuristics import IncrementalHeuristic
+from loaders import HEADER, CORPUS_MAGIC, INT
+
+AUTO_TABLE = 8 # Nombre de cases jusqu'auquel la table des distances est calculée à la volée (8! = 40320 états)
+
+def get_distance_table(m, n, table_dir=None):
+    """
+    Returns the distance table of the m*n grids: loaded from table_dir if it is there, computed if the grid has at most
+    AUTO_TABLE cells, None otherwise.
+    """
+    from distance_table import DistanceTable, table_file
+    if table_dir is not None and os.path.exists(table_file(table_dir, m, n)):
+        return DistanceTable.load(table_file(table_dir, m, n), m, n)
+    if m*n <= AUTO_TABLE:
+        return DistanceTable.build(m, n)
+    return None
+
+def table_instances(table, lo, hi, rng, chunk=4096):
+    """
+    Infinite generator of the pairs (l, d) of flattened grids l at distance d in [lo, hi], drawn uniformly (with
+    replacement) among the states of the distance table. The grids are drawn chunk at a time.
+    """
+    candidates = np.flatnonzero((table.dist >= lo) & (table.dist <= hi))
+    if len(candidates) == 0:
+        raise ValueError(f"No {table.m}x{table.n} grid at a distance in [{lo}, {hi}]")
+    while True:
+        for r in rng.choice(candidates, chunk).tolist():
+            yield table.codec.decode(r), int(table.dist[r])
+
+def walk_instances(m, n, lo, hi, rng, max_walk=None):
+    """
+    Infinite generator of the pairs (l, d) of flattened grids l at distance d in [lo, hi], obtained by random walks
+    from the sorted grid (without immediately undoing a swap) checked against their exact distance. The length of the
+    walks starts at hi and is adjusted after each grid: longer when the grid is too close, shorter when it is too far.
+    Raises ValueError if no grid is found after walks of max_walk swaps (default 4*hi+10), i.e. if the band is empty.
+    """
+    codec = get_codec(m, n)
+    h = IncrementalHeuristic(m, n)
+    goal = codec.goal()
+    edges = codec.edges
+    max_walk = max_walk if max_walk is not None else 4*hi + 10
+    length = hi
+    misses = 0
+    while True:
+        l = list(range(1, m*n+1))
+        last = int(rng.integers(0, len(edges)))
+        for r in rng.integers(0, len(edges) - 1, length).tolist():
+            k = (last + 1 + r) % len(edges) # Tirage uniforme parmi les swaps autres que le précédent
+            a, b = edges[k]
+            l[a], l[b] = l[b], l[a]
+            last = k
+        lower = h.value(h.init(l))
+        if lower == length: # Minorant et majorant égaux : distance exacte sans recherche
+            d = length
+        elif lower > hi: # Trop loin de toute façon : le minorant suffit pour raccourcir la marche
+            d = lower
+        else:
+            d = len(Graph([]).bfs_a_star(codec.encode(l), goal, m, n, h, codec, moves=True))
+        if lo <= d <= hi:
+            misses = 0
+            yield l, d
+        else:
+            misses += 1
+            if misses > 100 and length >= max_walk:
+                raise ValueError(f"No {m}x{n} grid found at a distance in [{lo}, {hi}]")
+        if d < lo:
+            length = min(length + 1, max_walk)
+        elif d > hi:
+            length = max(length - 1, 1)
+
+def generate(m, n, lo, hi=None, count=None, seed=0, table_dir=None):
+    """
+    Generator of count (infinite if None) pairs (l, d): flattened m*n grids l at distance d from the sorted grid, with
+    lo <= d <= hi (hi = lo by default). The same seed gives the same grids.
+    """
+    hi = lo if hi is None else hi
+    if not 0 <= lo <= hi:
+        raise ValueError(f"Invalid distance band [{lo}, {hi}]")
+    rng = np.random.default_rng(seed)
+    table = get_distance_table(m, n, table_dir)
+    instances = table_instances(table, lo, hi, rng) if table is not None else walk_instances(m, n, lo, hi, rng)
+    i = 0
+    for l, d in instances:
+        if count is not None and i >= count:
+            return
+        yield l, d
+        i += 1
+
+def write_grid_files(instances, out_dir, m, n, prefix="grid"):
+    """
+    Writes each grid of instances (pairs (l, d), see generate) as a grid file out_dir/{prefix}{i}.in, as soon as it is
+    generated, and their distances in out_dir/distances.txt (lines "file distance"). Returns the number of grids.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    with open(os.path.join(out_dir, "distances.txt"), "w") as index:
+        for l, d in instances:
+            name = f"{prefix}{count}.in"
+            with open(os.path.join(out_dir, name), "w") as file:
+                file.write(f"{m} {n}\n")
+                for i in range(m):
+                    file.write(" ".join(map(str, l[i*n:(i+1)*n])) + "\n")
+            index.write(f"{name} {d}\n")
+            count += 1
+    return count
+
+def write_corpus_binary(instances, file_name, m, n, chunk=4096):
+    """
+    Writes the grids of instances (pairs (l, d), see generate) in a binary corpus file (see loaders.read_corpus_binary),
+    chunk records at a time. Returns the number of grids.
+    """
+    count = 0
+    with open(file_name, "wb") as file:
+        file.write(HEADER.pack(CORPUS_MAGIC, m, n))
+        records = []
+        for l, d in instances:
+            records.append(l + [d])
+            if len(records) == chunk:
+                file.write(np.array(records, dtype=INT).tobytes())
+                count += len(records)
+                records = []
+        if records:
+            file.write(np.array(records, dtype=INT).tobytes())
+            count += len(records)
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate swap puzzle grids at a given distance from the sorted grid.")
+    parser.add_argument("m", type=int, help="number of lines")
+    parser.add_argument("n", type=int, help="number of columns")
+    parser.add_argument("--distance", type=int, required=True, help="distance of the grids (lower end of the band)")
+    parser.add_argument("--max-distance", type=int, default=None, help="upper end of the band (default: --distance)")
+    parser.add_argument("--count", type=int, default=100, help="number of grids")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generation")
+    parser.add_argument("--table-dir", default=None, help="directory of the precomputed distance tables")
+    parser.add_argument("--prefix", default="grid", help="prefix of the grid file names")
+    out = parser.add_mutually_exclusive_group(required=True)
+    out.add_argument("--out-dir", default=None, help="directory of the grid files")
+    out.add_argument("--binary", default=None, help="binary corpus file")
+    args = parser.parse_args(argv)
+
+    instances = generate(args.m, args.n, args.distance, args.max_distance, args.count, args.seed, args.table_dir)
+    if args.out_dir is not None:
+        count = write_grid_files(instances, args.out_dir, args.m, args.n, args.prefix)
+    else:
+        count = write_corpus_binary(instances, args.binary, args.m, args.n)
+    print(f"{count} grids written", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
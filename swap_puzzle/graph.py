@@ -3,7 +3,68 @@ This is the graph module. It contains a minimalistic Graph class.
 """
 
 import heapq # Pour le A*
+import functools
+import time
+from collections import deque, OrderedDict
 from grid import Grid
+from codec import get_codec
+from implicit_bfs import ImplicitBFS
+from heuristics import IncrementalHeuristic
+
+class BucketQueue:
+    """
+    The open list of the A*: a priority queue for integer priorities f, made of one bucket per value of f. Within a
+    bucket the states are sorted by their cost g and the largest g comes out first (for the same f, the deepest states
+    are the closest to the goal). Pushing and popping cost O(1), except when a bucket is created or emptied: the values
+    of f of the non-empty buckets are kept in a heap, which stays tiny since f only takes a few distinct values.
+
+    Attributes:
+    -----------
+    buckets: dict
+        buckets[f][g] is the list of the states pushed with priority f and cost g
+    keys: list[int]
+        The heap of the values of f of the non-empty buckets
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.keys = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"<graph.BucketQueue: size={self.size}, buckets={len(self.keys)}>"
+
+    def push(self, f, g, v):
+        """
+        Adds the state v with the priority f and the cost g.
+        """
+        bucket = self.buckets.get(f)
+        if bucket is None:
+            bucket = self.buckets[f] = []
+            heapq.heappush(self.keys,f) # Seule opération en O(log) : à la création d'un seau
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(v)
+        self.size += 1
+
+    def pop(self):
+        """
+        Removes and returns (f, g, v) for a state v of smallest priority f, of largest cost g among them.
+        """
+        f = self.keys[0]
+        bucket = self.buckets[f]
+        g = len(bucket) - 1 # Le dernier sous-seau n'est jamais vide
+        v = bucket[g].pop()
+        while bucket and not bucket[-1]:
+            bucket.pop()
+        if not bucket:
+            del self.buckets[f]
+            heapq.heappop(self.keys)
+        self.size -= 1
+        return f, g, v
 
 class Graph:
     """
@@ -23,6 +84,8 @@ class Graph:
         The number of edges. 
     edges: list[tuple[NodeType, NodeType]]
         The list of all edges
+    nodes_expanded: int
+        The number of states expanded by the last search on the graph of the states of a grid (bfs_a_star)
     """
 
     def __init__(self, nodes=[]):
@@ -39,6 +102,7 @@ class Graph:
         self.nb_nodes = len(nodes)
         self.nb_edges = 0
         self.edges = []
+        self.nodes_expanded = 0
         
     def __str__(self):
         """
@@ -84,22 +148,41 @@ class Graph:
         self.nb_edges += 1
         self.edges.append((node1, node2))
 
-    def bfs_aux(self, src, dst): #Fonction "auxiliaire" qui fait le bfs et crée la liste prev pour reconstruire le chemin
-        queue = []
+    def bfs_aux(self, src, dst=None, stats=None): #Fonction "auxiliaire" qui fait le bfs et crée la liste prev pour reconstruire
+        on = stats is not None                       # le chemin. stats est un SearchStats optionnel (voir search_stats.py)
+        if on:
+            start = time.perf_counter()
+            expanded = generated = 0
+            max_open = 1
+        queue = deque()     # File en O(1) des deux côtés, list.pop(0) était en O(n)
         prev = [-1 for i in range(self.nb_nodes)]
         explored = [False for i in range(self.nb_nodes)] 
         explored[src-1] = True
         queue.append(src)
+        result = [] if dst is not None else prev # Sans destination on renvoie l'arbre du bfs complet depuis src
         while not(len(queue) == 0): # On continue d'explorer tant qu'on n'a pas tout vu
-            v = queue.pop(0)
+            v = queue.popleft()
             if v == dst:
-                return prev # Si on trouve le sommet destination pas besoin de chercher plus on peut remonter à la racine
+                result = prev # Si on trouve le sommet destination pas besoin de chercher plus on peut remonter à la racine
+                break
             for n in self.graph[v]:
                 if not(explored[n-1]):
                     explored[n-1] = True
                     prev[n-1] = v
                     queue.append(n)
-        return []
+            if on: # Compteurs locaux, copiés dans stats à la fin
+                expanded += 1
+                generated += len(self.graph[v])
+                if len(queue) > max_open:
+                    max_open = len(queue)
+                if stats.callback is not None and expanded % stats.sample == 0:
+                    stats.callback(v, None, None, len(queue))
+        if on:
+            stats.expanded += expanded
+            stats.generated += generated
+            stats.max_open = max(stats.max_open, max_open)
+            stats.time_total += time.perf_counter() - start
+        return result
 
     def get_path(self,src,dst,prev): #Fonction qui reconstruit le chemin le plus court à partir du bfs déjà effectué
         path = [dst]
@@ -111,7 +194,7 @@ class Graph:
         path.reverse()
         return path
 
-    def bfs(self, src, dst): # La fonctions bfs en elle même est plus une fonction auxiliaire, c'est bfs_aux le coeur du bfs
+    def bfs(self, src, dst, stats=None): # La fonctions bfs en elle même est plus une fonction auxiliaire, c'est bfs_aux le coeur du bfs
         """
         Finds a shortest path from src to dst by BFS.  
 
@@ -121,13 +204,17 @@ class Graph:
             The source node.
         dst: NodeType
             The destination node.
+        stats: SearchStats | None
+            Statistics filled by the search (see search_stats.py)
 
         Output: 
         -------
         path: list[NodeType] | None
             The shortest path from src to dst. Returns None if dst is not reachable from src
         """ 
-        prev = self.bfs_aux(src,dst) # On récupère juste la liste des parents obtenue à partir de bfs_aux que l'on traite
+        if src == dst: # Chemin sans arête, comme CSRGraph.bfs
+            return [src]
+        prev = self.bfs_aux(src,dst,stats) # On récupère juste la liste des parents obtenue à partir de bfs_aux que l'on traite
         if prev != []:
             return self.get_path(src,dst,prev)
         else:
@@ -141,7 +228,7 @@ class Graph:
         The file should have the following format: 
             The first line of the file is 'n m'
             The next m lines have 'node1 node2'
-        The nodes (node1, node2) should be named 1..n
+        The nodes (node1, node2) should be named 1..n. The file can also be a binary graph file (see loaders.py).
 
         Parameters: 
         -----------
@@ -153,75 +240,471 @@ class Graph:
         graph: Graph
             An object of the class Graph with the graph from file_name.
         """
-        with open(file_name, "r") as file:
-            n, m = map(int, file.readline().split())
-            graph = Graph(range(1, n+1))
-            for _ in range(m):
-                edge = list(map(int, file.readline().split()))
-                if len(edge) == 2:
-                    node1, node2 = edge
-                    graph.add_edge(node1, node2) # will add dist=1 by default
-                else:
-                    raise Exception("Format incorrect")
+        from loaders import read_graph # Import tardif : numpy n'est chargé que pour lire des fichiers
+        n, edges = read_graph(file_name) # Tout le fichier est lu en une passe, texte ou binaire
+        csr = CSRGraph.from_edges(n, edges) # Les listes d'adjacence sont construites en bloc, dans l'ordre des arêtes
+        graph = Graph(range(1, n+1))
+        offsets, targets = csr.offsets.tolist(), csr.targets.tolist()
+        graph.graph = {v: targets[offsets[v]:offsets[v+1]] for v in range(1, n+1)}
+        graph.edges = list(zip(edges[:, 0].tolist(), edges[:, 1].tolist()))
+        graph.nb_edges = len(graph.edges)
         return graph
 
-    def bfs_generate_graph(self,src,dst,m,n):
-        maxsize = (m*n+1)**(m*n+1) # Borne supérieure un peu grossière sur les entiers générés par la fonction de hashage
-        g = Grid(m,n)
-        queue = []
-        prev = [-1 for i in range(maxsize)] # Pas très optimisé... 
-        explored = []
-        explored.append(src-1)
-        queue.append(src)
-        while not(len(queue) == 0): # Le principe est le même que le bfs usuel maintenant
-            v = queue.pop(0)
-            if v == dst:
-                return prev
-            cur_grid = g.id_to_grid(v,m,n) # Calcul de la grid actuelle (on passe du hash (un entier) à un élément de type Grid)
-            neighbours = cur_grid.adj_grids() # Calcul des grids voisines de la grid actuelle
-            neighbours = [g.id_to_grid(v,m,n) for v in neighbours] # Rend les états voisins hashable
-            for ne in neighbours:
-                if not(g.id(ne.flatten()) in explored):
-                    explored.append(g.id(ne.flatten()))
-                    queue.append(g.id(ne.flatten()))
-                    prev[g.id(ne.flatten())-1] = v
-        return []
-
-    def get_neighbours(self,v,m,n): # La fonction est celle que l'on utilise dans le A*, elle allège le code mais fait la même 
-        g = Grid(m,n)               # chose que dans le bfs classique (les lignes sont copiées sauf l'avant dernière)
-        cur_grid = g.id_to_grid(v,m,n) # Calcul de la grid actuelle
-        neighbours = cur_grid.adj_grids() # Calcul des grids voisines de la grid actuelle
-        neighbours = [(1,v) for v in neighbours] # Rend les états voisins hashable, coût de 1 entre sommets adj pour le A*
-        return neighbours
-
-    def bfs_a_star(self,src,dst,m,n,h): # h est l'heuristique à utiliser
-        open_list = [(0,src)] # Création de la liste des sommets à considérer (file de prio) avec le sommet initial (distance 0)
-        prev = {}             # Dans la file de priorité les sommets sont stockés sont la forme (dst, sommet)
+    def bfs_generate_graph(self,src,dst,m,n,stats=None): # Bfs sur le graphe implicite des états, src et dst sont les id (en
+        codec, rank = get_codec(m,n), get_codec(m,n,"rank")                # base m*n+1), stats un SearchStats optionnel
+        bfs = ImplicitBFS(m,n) # Mémoire en (m*n)! octets et non plus en (m*n+1)**(m*n+1)
+        r_dst = rank.encode(codec.decode(dst))
+        if not bfs.run(rank.encode(codec.decode(src)),r_dst,stats):
+            return []
+        path = [codec.encode(rank.decode(r)) for r in bfs.get_path(r_dst)]
+        prev = {src-1: -1} # Seuls les parents du chemin sont renvoyés, dans le format attendu par get_path
+        for i in range(1,len(path)):
+            prev[path[i]-1] = path[i-1]
+        return prev
+
+    def get_neighbours(self,v,m,n,codec=None): # La fonction est celle que l'on utilise dans le A*, elle renvoie les voisins
+        if codec is None:                         # directement depuis l'identifiant, sans repasser par des objets Grid
+            codec = get_codec(m,n)
+        return [(1,ne) for ne, k in codec.neighbours(v)] # Coût de 1 entre sommets adjacents pour le A*
+
+    def get_moves(self,v,m,n,codec=None): # Comme get_neighbours mais renvoie aussi le swap qui mène à chaque voisin
+        if codec is None:
+            codec = get_codec(m,n)
+        return [(ne,codec.swaps[k]) for ne, k in codec.neighbours(v)]
+
+    def bfs_a_star(self,src,dst,m,n,h,codec=None,cache=None,moves=False,stats=None): # h est l'heuristique à utiliser, codec
+                             # celui de src et dst. Si moves, renvoie les indices des swaps et non les sommets. stats est un
+                             # SearchStats optionnel (voir search_stats.py) rempli pendant la recherche
+        on = stats is not None # Sans stats l'instrumentation ne coûte que des tests de booléens locaux
+        timed = on and stats.timing
+        clock = time.perf_counter
+        start = clock()
+        incremental = isinstance(h,IncrementalHeuristic) # Heuristique mise à jour à chaque swap plutôt que recalculée
+        if codec is not None and not incremental:
+            h = functools.partial(h,codec=codec) # L'heuristique garde la signature h(p,q,m,n)
+        if codec is None:
+            codec = get_codec(m,n)
+        open_list = BucketQueue() # File de priorité des sommets à considérer, un seau par valeur de f = g + h
+        open_list.push(0,0,src)   # sommet initial (distance 0)
+        prev = {}             # sommet -> (parent, indice du swap qui y mène)
         dist = {src: 0}       # L'utilisation d'un dictionnaire nous fait gagner du temps comme les sommets sont hash, il sert à
-        g = Graph([])         # la fois à stocker les distances au sommet source mais aussi à savoir si un sommet a déjà été vu
+                              # la fois à stocker les distances au sommet source mais aussi à savoir si un sommet a déjà été vu
+        closed = set()        # Sommets déjà étendus : leurs entrées restées dans la file sont ignorées
+        if incremental:
+            if timed:
+                t = clock()
+            comps = {src: h.init(codec.decode(src))} # Composantes de l'heuristique de chaque sommet déjà vu
+            if timed:
+                stats.time_heuristic += clock() - t
+        if cache is not None: # Un SolutionCache donne la distance exacte des états déjà résolus
+            packed = get_codec(m,n,"packed")
+            exact = {} # Suite des swaps (en cache) des sommets sortis de la file dont la distance à dst est connue
+        if on:
+            reopened = set() # Sommets étendus puis atteints par un chemin plus court
+            stats.max_open = max(stats.max_open,1)
+        self.nodes_expanded = 0
+        result = None
         while(open_list):
-            cur_cost, cur_node = heapq.heappop(open_list)
+            if timed:
+                t = clock()
+            cur_cost, cur_g, cur_node = open_list.pop()
+            if timed:
+                stats.time_queue += clock() - t
+            if cur_node in closed or cur_g != dist[cur_node]: # Entrée périmée : le sommet a été atteint depuis par un chemin
+                if on:                                        # plus court, ou déjà étendu
+                    stats.stale += 1
+                continue
             if cur_node == dst:
-                path = [dst]
-                while cur_node in prev: # Permet de faire une boucle de manière intelligente sur le dictionnaire puisque  on va automatiquement s'arrêter quand on atteint src parce qu'il n'a pas de parent
-                    cur_node = prev[cur_node]
-                    path.append(cur_node)
-                path.reverse() # Linéaire en la taille du chemin
-                return path
-            neighbours = g.get_neighbours(cur_node,m,n) # voisins du sommet qu'on récupère sous une forme de liste déjà hash
-            for cost, ne in neighbours:
-                new_cost = dist[cur_node] + cost # On met à jour les distances, cost vaut toujours 1 ici en réalité
+                result = self.trace_moves(dst,prev) if moves else self.trace_path(dst,prev)
+                break
+            if cache is not None: # Le cache n'est consulté que pour les sommets sortis de la file, pas pour chaque voisin
+                if cur_node in exact:
+                    suffix = exact[cur_node]
+                else:
+                    suffix = cache.get_solution(packed,packed.encode(codec.decode(cur_node)))
+                if suffix is not None:
+                    exact[cur_node] = suffix
+                    if cur_cost < dist[cur_node] + len(suffix): # On le remet dans la file avec f = g + distance exacte
+                        open_list.push(cur_g + len(suffix),cur_g,cur_node)
+                        continue # Inutile de l'étendre : le meilleur chemin qui passe par lui finit par suffix
+                    if moves: # f = g + distance exacte est minimal : le reste du chemin est optimal
+                        result = self.trace_moves(cur_node,prev) + list(suffix)
+                        break
+                    result = self.trace_path(cur_node,prev)
+                    l = codec.decode(cur_node)
+                    for k in suffix:
+                        a, b = codec.edges[k]
+                        l[a], l[b] = l[b], l[a]
+                        result.append(codec.encode(l))
+                    break
+            closed.add(cur_node)
+            self.nodes_expanded += 1
+            if on:
+                if cur_node in reopened:
+                    reopened.discard(cur_node)
+                    stats.reexpanded += 1
+                if stats.callback is not None and self.nodes_expanded % stats.sample == 0:
+                    stats.callback(cur_node,cur_g,cur_cost,len(open_list))
+                if timed:
+                    t = clock()
+            if incremental:
+                l = codec.decode(cur_node) # Un seul décodage par sommet étendu
+            neighbours = codec.neighbours(cur_node) # voisins du sommet qu'on récupère sous une forme de liste déjà hash
+            if on:
+                stats.generated += len(neighbours)
+                if timed:
+                    stats.time_expand += clock() - t
+            new_cost = cur_g + 1 # On met à jour les distances, chaque swap coûte 1
+            for ne, k in neighbours:
                 if ne not in dist or new_cost < dist[ne]: # Si on trouve un meilleur chemin on update la distance à src
                     dist[ne] = new_cost
-                    h_score = new_cost + h(ne,dst,m,n) # h_score seulement considéré pour la file de priorité
-                    heapq.heappush(open_list,(h_score,ne)) # On utilise le h_score donné par l'heuristique pour classer
-                    prev[ne] = cur_node
-        return None
+                    if on and ne in closed:
+                        reopened.add(ne)
+                    closed.discard(ne) # Heuristique non consistante : le sommet doit être étendu de nouveau
+                    if timed:
+                        t = clock()
+                    if incremental:
+                        a, b = codec.edges[k]
+                        comps[ne] = h.update(l,comps[cur_node],a,b)
+                        h_score = new_cost + h.value(comps[ne])
+                    else:
+                        h_score = new_cost + h(ne,dst,m,n) # h_score seulement considéré pour la file de priorité
+                    if timed:
+                        t2 = clock()
+                        stats.time_heuristic += t2 - t
+                    open_list.push(h_score,new_cost,ne) # On utilise le h_score donné par l'heuristique pour classer
+                    if timed:
+                        stats.time_queue += clock() - t2
+                    prev[ne] = (cur_node,k)
+            if on and len(open_list) > stats.max_open:
+                stats.max_open = len(open_list)
+        if on:
+            stats.expanded += self.nodes_expanded
+            stats.time_total += clock() - start
+        return result
+
+    def ara_star(self,src,dst,m,n,h,w=5.,w_step=1.,time_budget=None,node_budget=None,codec=None,moves=False): # ARA*
+        """
+        Anytime search (ARA*): a first search with f = g + w*h quickly finds a solution, then w is decreased by w_step
+        down to 1 and each new search reuses the states already reached (their g values, and the states whose g improved
+        after their expansion). This is a generator that yields (path, bound) each time a search ends with a solution:
+        the cost of path is at most bound times the optimal cost (for an admissible and consistent heuristic h). It stops
+        when the solution is proven optimal (bound 1), or as soon as time_budget (seconds) or node_budget (expansions) is
+        exhausted. If moves is True, the paths are given as the lists of the indices of their swaps (see trace_moves).
+        """
+        incremental = isinstance(h,IncrementalHeuristic)
+        if codec is not None and not incremental:
+            h = functools.partial(h,codec=codec)
+        if codec is None:
+            codec = get_codec(m,n)
+        start = time.perf_counter()
+        dist = {src: 0}
+        prev = {}
+        if incremental:
+            comps = {src: h.init(codec.decode(src))}
+            h_val = {src: h.value(comps[src])}
+        else:
+            h_val = {src: h(src,dst,m,n)}
+        open_set = {src} # Sommets à étendre avec le w courant
+        incons = set()   # Sommets déjà étendus avec ce w dont la distance a diminué depuis : étendus au prochain w
+        closed = set()
+        best = None
+        self.nodes_expanded = 0
+        while True:
+            heap = [(dist[v] + w*h_val[v],-dist[v],v) for v in open_set] # Clés recalculées pour le nouveau w
+            heapq.heapify(heap)                                             # à égalité, le plus grand g d'abord
+            while heap:
+                key, neg_g, cur_node = heap[0]
+                if cur_node not in open_set or -neg_g != dist[cur_node]: # Entrée périmée
+                    heapq.heappop(heap)
+                    continue
+                if dst in dist and dist[dst] <= key: # Aucun sommet restant ne peut améliorer la solution pour ce w
+                    break
+                if (node_budget is not None and self.nodes_expanded >= node_budget) or \
+                   (time_budget is not None and time.perf_counter() - start >= time_budget):
+                    return
+                heapq.heappop(heap)
+                open_set.remove(cur_node)
+                closed.add(cur_node)
+                self.nodes_expanded += 1
+                if incremental:
+                    l = codec.decode(cur_node)
+                new_cost = dist[cur_node] + 1
+                for ne, k in codec.neighbours(cur_node):
+                    if ne not in dist or new_cost < dist[ne]:
+                        if ne not in h_val:
+                            if incremental:
+                                a, b = codec.edges[k]
+                                comps[ne] = h.update(l,comps[cur_node],a,b)
+                                h_val[ne] = h.value(comps[ne])
+                            else:
+                                h_val[ne] = h(ne,dst,m,n)
+                        dist[ne] = new_cost
+                        prev[ne] = (cur_node,k)
+                        if ne in closed:
+                            incons.add(ne)
+                        else:
+                            open_set.add(ne)
+                            heapq.heappush(heap,(new_cost + w*h_val[ne],-new_cost,ne))
+            if dst not in dist:
+                return # Aucun chemin
+            lower = min((dist[v] + h_val[v] for v in open_set | incons), default=dist[dst]) # Minorant du coût optimal
+            bound = max(1.,min(w,dist[dst]/lower)) if lower > 0 else 1.
+            if best is None or dist[dst] < best[0] or bound < best[1]: # Meilleure solution, ou meilleure garantie
+                best = (dist[dst],bound)
+                yield (self.trace_moves(dst,prev) if moves else self.trace_path(dst,prev)), bound
+            if bound == 1. or w == 1.:
+                return
+            w = max(1.,w - w_step)
+            open_set |= incons
+            incons = set()
+            closed = set()
+
+    def trace_path(self,node,prev): # Sommets du chemin de src à node, prev[v] = (parent, indice du swap) comme dans le A*
+        path = [node]
+        while path[-1] in prev: # On s'arrête automatiquement sur src parce qu'il n'a pas de parent
+            path.append(prev[path[-1]][0])
+        path.reverse() # Linéaire en la taille du chemin
+        return path
+
+    def trace_moves(self,node,prev): # Indices (dans codec.edges) des swaps du chemin de src à node, en O(profondeur) : aucun
+        moves = []                   # sommet n'est décodé
+        while node in prev:
+            node, k = prev[node]
+            moves.append(k)
+        moves.reverse()
+        return moves
+
+    def iter_swaps(self,moves,m,n,codec=None): # Générateur des swaps (format de Grid.swap) d'une liste d'indices de swaps
+        if codec is None:
+            codec = get_codec(m,n)
+        for k in moves:
+            yield codec.swaps[k]
 
-    def path_to_swap(self,path,m,n): # Fonction auxiliaire qui renvoie la liste de swap à effectuer à partir d'un chemin dans le
+    def path_to_swap(self,path,m,n,codec=None): # Fonction auxiliaire qui renvoie la liste de swap à effectuer à partir d'un chemin dans le
         g = Grid(1,1)                # graphe, prend en argument le chemin (une suite de grilles)
         swap_list = []
         for i in range(len(path)-1):
-            swap = g.findswap(path[i],path[i+1],m,n)
+            swap = g.findswap(path[i],path[i+1],m,n,codec)
             swap_list.append(swap)
-        return swap_list
\ No newline at end of file
+        return swap_list
+
+
+class CSRGraph:
+    """
+    A frozen undirected graph in compressed sparse row format, for large graphs: the neighbours of the node v are
+    targets[offsets[v]:offsets[v+1]]. The nodes are 1..nb_nodes as in Graph.graph_from_file (offsets[0] is unused) and the
+    neighbours of each node are in the same order as in the adjacency lists of the Graph built from the same edges.
+
+    Attributes:
+    -----------
+    nb_nodes: int
+        The number of nodes.
+    nb_edges: int
+        The number of edges.
+    offsets: numpy.ndarray
+        Array of int64 of size nb_nodes+2, the start of the neighbours of each node in targets
+    targets: numpy.ndarray
+        Array of int32 of size 2*nb_edges, the concatenation of the adjacency lists
+    """
+
+    def __init__(self, nb_nodes, offsets, targets):
+        """
+        Initializes the graph from already built arrays (see from_edges).
+        """
+        self.nb_nodes = nb_nodes
+        self.nb_edges = len(targets)//2
+        self.offsets = offsets
+        self.targets = targets
+
+    def __repr__(self):
+        """
+        Returns a representation of the graph with number of nodes and edges.
+        """
+        return f"<graph.CSRGraph: nb_nodes={self.nb_nodes}, nb_edges={self.nb_edges}>"
+
+    @classmethod
+    def from_edges(cls, nb_nodes, edges):
+        """
+        Builds the graph from the array of shape (nb_edges, 2) of its edges, in one stable sort.
+        """
+        import numpy as np # Import tardif : numpy n'est chargé que pour les grands graphes
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if len(edges) > 0 and (edges.min() < 1 or edges.max() > nb_nodes):
+            raise ValueError(f"The nodes must be named 1..{nb_nodes}")
+        src = edges.ravel() # Chaque arête apparaît dans les deux sens, dans l'ordre des arêtes
+        dst = edges[:, ::-1].ravel()
+        order = np.argsort(src*len(src) + np.arange(len(src))) # Clés distinctes : même ordre qu'un tri stable, plus rapide
+        offsets = np.zeros(nb_nodes+2, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=nb_nodes+1), out=offsets[1:])
+        return cls(nb_nodes, offsets, dst[order].astype(np.int32))
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Builds the graph from a Graph whose nodes are 1..graph.nb_nodes.
+        """
+        return cls.from_edges(graph.nb_nodes, graph.edges)
+
+    @classmethod
+    def from_file(cls, file_name):
+        """
+        Reads a graph file in one of the formats of Graph.graph_from_file. No Graph is built.
+        """
+        from loaders import read_graph
+        return cls.from_edges(*read_graph(file_name))
+
+    def neighbours(self, v):
+        """
+        Returns the array of the neighbours of v.
+        """
+        return self.targets[self.offsets[v]:self.offsets[v+1]]
+
+    def nbytes(self):
+        """
+        Returns the memory used by the adjacency arrays, in bytes.
+        """
+        return self.offsets.nbytes + self.targets.nbytes
+
+    def bfs_aux(self, src, dst=None, stats=None):
+        """
+        BFS from src, level by level: each level is handled as a whole with numpy (gather of the neighbours of the frontier
+        in targets). Returns the array of the parents (prev[src] = src, -1 for the nodes not reached), the search stops at
+        the end of the level where dst is reached (dst None: the whole BFS tree of src). If stats (a SearchStats) is given,
+        it is updated level by level; the callback is called on every sample-th expanded node, as in Graph.bfs_aux, once the
+        level of this node has been expanded.
+        """
+        import numpy as np
+        if stats is not None:
+            start = time.perf_counter()
+            stats.max_open = max(stats.max_open, 1)
+            expanded = 0
+        offsets, targets = self.offsets, self.targets
+        prev = np.full(self.nb_nodes+1, -1, dtype=np.int32)
+        prev[src] = src
+        frontier = np.array([src], dtype=np.int64)
+        while len(frontier) > 0 and (dst is None or prev[dst] == -1):
+            starts = offsets[frontier]
+            lens = offsets[frontier+1] - starts
+            total = int(lens.sum())
+            if stats is not None:
+                stats.expanded += len(frontier)
+                stats.generated += total
+                if stats.callback is not None: # Sommets de la frontière dont le rang d'expansion est un multiple de sample
+                    for v in frontier[stats.sample - expanded % stats.sample - 1::stats.sample].tolist():
+                        stats.callback(v, None, None, len(frontier))
+                expanded += len(frontier)
+            if total == 0:
+                break
+            first = np.cumsum(lens) - lens
+            nbrs = targets[np.arange(total) - np.repeat(first - starts, lens)] # Voisins de tous les sommets de la frontière
+            parents = np.repeat(frontier, lens)
+            new = prev[nbrs] == -1
+            nbrs, parents = nbrs[new], parents[new]
+            first = np.sort(np.unique(nbrs, return_index=True)[1]) # Première découverte de chaque sommet, dans l'ordre de la file
+            frontier = nbrs[first].astype(np.int64)                # du bfs de Graph : on obtient exactement les mêmes parents
+            prev[frontier] = parents[first]
+            if stats is not None:
+                stats.max_open = max(stats.max_open, len(frontier))
+        if stats is not None:
+            stats.time_total += time.perf_counter() - start
+        return prev
+
+    def bfs(self, src, dst, stats=None):
+        """
+        Finds a shortest path from src to dst by BFS, None if dst is not reachable from src. stats is an optional
+        SearchStats (see bfs_aux).
+        """
+        prev = self.bfs_aux(src, dst, stats)
+        if prev[dst] == -1:
+            return None
+        path = [dst]
+        while path[-1] != src:
+            path.append(int(prev[path[-1]]))
+        path.reverse()
+        return path
+
+
+class BFSQueryEngine:
+    """
+    Answers many shortest path queries (src, dst) on a Graph or a CSRGraph. The whole BFS tree of each source is computed
+    once and kept in a LRU cache, then each query only walks up the tree from dst, in O(length of the path).
+
+    Attributes:
+    -----------
+    graph: Graph | CSRGraph
+        The graph, whose nodes are 1..graph.nb_nodes
+    max_bytes: int
+        The memory allowed for the cached trees, in bytes. The least recently used trees are evicted beyond it (the last
+        tree computed is always kept).
+    trees: OrderedDict
+        trees[src] is the array of int32 of the parents in the BFS tree of src (parent of src: src, -1 if not reached)
+    nbytes: int
+        The memory used by the cached trees, in bytes
+    hits: int
+        The number of queries answered with a cached tree
+    misses: int
+        The number of trees computed
+    """
+
+    def __init__(self, graph, max_bytes=256*2**20):
+        self.graph = graph
+        self.max_bytes = max_bytes
+        self.trees = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"<graph.BFSQueryEngine: trees={len(self.trees)}, nbytes={self.nbytes}>"
+
+    def tree(self, src):
+        """
+        Returns the BFS tree of src (see trees), computed if it is not in the cache.
+        """
+        if src in self.trees:
+            self.hits += 1
+            self.trees.move_to_end(src)
+            return self.trees[src]
+        self.misses += 1
+        if isinstance(self.graph, CSRGraph):
+            parents = self.graph.bfs_aux(src)
+        else:
+            import numpy as np
+            parents = np.empty(self.graph.nb_nodes+1, dtype=np.int32)
+            parents[0] = -1
+            parents[1:] = self.graph.bfs_aux(src)
+            parents[src] = src
+        self.trees[src] = parents
+        self.nbytes += parents.nbytes
+        while self.nbytes > self.max_bytes and len(self.trees) > 1:
+            self.nbytes -= self.trees.popitem(last=False)[1].nbytes
+        return parents
+
+    def path(self, src, dst):
+        """
+        Returns a shortest path from src to dst, None if dst is not reachable from src.
+        """
+        parents = self.tree(src)
+        if parents[dst] == -1:
+            return None
+        path = [dst]
+        while path[-1] != src:
+            path.append(int(parents[path[-1]]))
+        path.reverse()
+        return path
+
+    def query_file(self, file_name, out_file=None):
+        """
+        Answers the queries of file_name, one "src dst" per line (what follows on a line is ignored, so a .path.out file
+        can be given). The answers are written in out_file, if given, in the format of the .path.out files: "src dst
+        length path" or "src dst None". Returns the list of the paths.
+        """
+        with open(file_name, "r") as file:
+            queries = [tuple(map(int, line.split()[:2])) for line in file if line.strip()]
+        paths = [self.path(src, dst) for src, dst in queries]
+        if out_file is not None:
+            with open(out_file, "w") as file:
+                for (src, dst), path in zip(queries, paths):
+                    file.write(f"{src} {dst} None\n" if path is None else f"{src} {dst} {len(path)-1} {path}\n")
+        return paths
@@ -3,8 +3,7 @@ This is the grid module. It contains the Grid class and its associated methods.
 """
 
 import random
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
+from codec import get_codec
 
 class IllegalMove(Exception): # On crée une exception pour les coups qui ne sont pas autorisés
     pass
@@ -113,29 +112,25 @@ class Grid():
             Name of the file to load. The file must be of the format: 
             - first line contains "m n" 
             - next m lines contain n integers that represent the state of the corresponding cell
+            It can also be a binary grid file (see loaders.py).
 
         Output: 
         -------
         grid: Grid
             The grid
         """
-        with open(file_name, "r") as file:
-            m, n = map(int, file.readline().split())
-            initial_state = [[] for i_line in range(m)]
-            for i_line in range(m):
-                line_state = list(map(int, file.readline().split()))
-                if len(line_state) != n: 
-                    raise Exception("Format incorrect")
-                initial_state[i_line] = line_state
-            grid = Grid(m, n, initial_state)
+        from loaders import read_grid # Import tardif : numpy n'est chargé que pour lire des fichiers
+        m, n, cells = read_grid(file_name) # Tout le fichier est lu en une passe, texte ou binaire
+        cells = cells.tolist()
+        initial_state = [cells[i*n:(i+1)*n] for i in range(m)]
+        grid = cls(m, n, initial_state)
         return grid
 
-    def id(self,l): # Injection des états de la grid dans N, représentation en base m*n+1 pour rendre les états hashable (Q6)
-        m = self.m
-        n = self.n
-        base = m*n+1
-        return sum(l[i]*(base)**i for i in range(len(l))) # Identifiant unique hashable, le code pour implémenter sum est donné en
-                                                          # appendix du rapport
+    def id(self,l,codec=None): # Injection des états de la grid dans N, représentation en base m*n+1 pour rendre les états hashable (Q6)
+        if codec is None:                # Le codec par défaut garde exactement les identifiants historiques
+            codec = get_codec(self.m,self.n)
+        return codec.encode(l) # Identifiant unique hashable, le code pour implémenter sum est donné en appendix du rapport
+
     def flatten(self): # Permet de convertir la grid de base en une seule list de taille m*n et de calculer ses permutations 
         l = []
         m = self.m
@@ -145,17 +140,8 @@ class Grid():
         return l
     
     def show_grid(self): 
-        m,n = self.m, self.n
-        cmap = plt.get_cmap('plasma') # Juste pour faire des jolies couleurs, gradient par défaut qui rend bien
-        plt.imshow(self.state, cmap=cmap, interpolation='nearest')
-        for i in range(m):
-            for j in range(n):
-                plt.text(j, i, self.state[i][j], ha='center', va='center', color='white')
-        plt.title('Grid :')
-        frame1 = plt.gca()
-        frame1.axes.get_xaxis().set_visible(False)
-        frame1.axes.get_yaxis().set_visible(False) # Pour faire disparaitre les indices x et y qui ne servent pas
-        plt.show()
+        from render import show_grid # Import tardif : matplotlib n'est chargé que si on affiche une grid
+        show_grid(self)
         
     def copy(self):    # Fonction utilitaire pour ajouter les arêtes entre sommets par la suite
         cpy_state = []
@@ -174,7 +160,7 @@ class Grid():
             for i in range(len(l)):
                 yield perm[:i] + l[0:1] + perm[i:]'''
 
-    def nextperm(self,i,j): # Renvoie les grids que l'on peut obtenir en permutant la case i,j de la grid 
+    def nextperm(self,i,j,codec=None): # Renvoie les grids que l'on peut obtenir en permutant la case i,j de la grid 
         swaps = []
         m,n = self.m, self.n
         if(i<m-1):
@@ -193,30 +179,19 @@ class Grid():
             g = self.copy()
             g.swap((i,j),(i,j-1))
             swaps.append(g.flatten())
-        l_ = [self.id(l) for l in swaps]
+        l_ = [self.id(l,codec) for l in swaps]
         return l_
         
-    def adj_grids(self): # Renvoie tous les états de la grid (sous forme d'entiers) qu'on obtient à partir d'une permutation 
-        allswaps = []    # depuis l'état actuel de la grid, permet de déterminer les arêtes à créer dans le graphe
-        m,n = self.m, self.n
-        for i in range(m):
-            for j in range(n):
-                s = self.nextperm(i,j)
-                for p in s:
-                    if p not in allswaps:
-                        allswaps.append(p)
-        return allswaps
+    def adj_grids(self,codec=None): # Renvoie tous les états de la grid (sous forme d'entiers) qu'on obtient à partir d'une permutation 
+        if codec is None:               # depuis l'état actuel de la grid, permet de déterminer les arêtes à créer dans le graphe
+            codec = get_codec(self.m,self.n)
+        return [v for v, k in codec.neighbours(codec.encode(self.flatten()))] # Chaque swap n'est généré qu'une fois
 
-    def id_to_grid(self,i,m,n): # Opération inverse de id pour créer les arêtes, i est l'entier représentant une grid
-        newgrid = [[] for i in range(m)]
-        for j in range(m):
-            subgrid = []
-            for k in range(n):
-                r = i % (m*n+1)
-                i -= r
-                i /= (m*n+1)
-                subgrid.append(int(r)) # Cast esthétique parce que le typage est moche
-            newgrid[j] = subgrid
+    def id_to_grid(self,i,m,n,codec=None): # Opération inverse de id pour créer les arêtes, i est l'identifiant d'une grid
+        if codec is None:
+            codec = get_codec(m,n)
+        l = codec.decode(i) # Décodage exact, en O(m*n) et sans flottants quelle que soit la taille de la grid
+        newgrid = [l[j*n:(j+1)*n] for j in range(m)]
         G = Grid(m,n,newgrid) # Faire attention, le poids faible est en premier et le poids fort en dernier dans la représentation
         return G              # en base m*n+1 donc pour le nombre 123456789 (base 10) le poids faible est 9 et le fort est 1 
                               # Donc la grid renvoyée est [[9, 8, 7], [6, 5, 4], [3, 2, 1]] et non l'inverse
@@ -236,32 +211,21 @@ class Grid():
                 G.add_edge(node,v)
         return G'''
 
-    def path_to_do(self): # Renvoie l'id du sommet initial et du sommet d'arrivée dans le graph des états pour bfs
-        m,n = self.m, self.n 
-        base = m*n+1
-        dst = sum((i+1)*(base)**i for i in range(m*n))
-        l = self.flatten()
-        src = self.id(l)
+    def path_to_do(self,codec=None): # Renvoie l'id du sommet initial et du sommet d'arrivée dans le graph des états pour bfs
+        if codec is None:
+            codec = get_codec(self.m,self.n)
+        src = codec.encode(self.flatten())
+        dst = codec.goal()
         return src,dst
     
-    def findswap(self,p,q,m,n): # Renvoie le premier swap entre deux grids trouvé, dans le path, on est garanti que les grid sont
-        g1 = self.id_to_grid(p,m,n) # adjacentes donc le premier swap trouvé est bien l'unique swap entre les deux grilles
-        g2 = self.id_to_grid(q,m,n)
-        for i in range(m):
-            for j in range(n):
-                if g1.state[i][j] != g2.state[i][j]:
-                    if i > 0:
-                        if g2.state[i-1][j] == g1.state[i][j]:
-                            return ((i-1,j),(i,j))
-                    if i < m-1:
-                        if g2.state[i][j] == g1.state[i+1][j]:
-                            return ((i,j),(i+1,j))
-                    if j > 0:
-                        if g2.state[i][j] == g1.state[i][j-1]:
-                            return ((i,j-1),(i,j))
-                    if j < m-1:
-                        if g2.state[i][j] == g1.state[i][j-1]:
-                            return ((i,j),(i,j+1))
+    def findswap(self,p,q,m,n,codec=None): # Renvoie le swap entre deux grids adjacentes du path
+        if codec is None:
+            codec = get_codec(m,n)
+        l1 = codec.decode(p)
+        l2 = codec.decode(q)
+        diff = [k for k in range(m*n) if l1[k] != l2[k]] # Exactement deux cases diffèrent entre deux grids adjacentes
+        a, b = diff
+        return ((a//n,a%n),(b//n,b%n))
 
     def generate_grid(self,difficulty): # difficulty est un entier de 1 à 3 représentant la difficulté à résoudre la grille
         m,n = self.m, self.n
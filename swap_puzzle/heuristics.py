@@ -1,42 +1,166 @@
-from grid import Grid
-
-def manhattan_distance(p,q,m,n):
-        g = Grid(1,1)
-        acc = 0 
-        g1 = g.id_to_grid(p,m,n)
-        g2 = g.id_to_grid(q,m,n)
-        for i in range(m):
-            for j in range(n):
-                acc += abs(g1.state[i][j] - g2.state[i][j])
+from codec import get_codec
+
+def manhattan_distance(p,q,m,n,codec=None):
+        if codec is None:
+            codec = get_codec(m,n)
+        acc = 0
+        l1 = codec.decode(p) # On travaille directement sur les grids aplaties, pas besoin de recréer des objets Grid
+        l2 = codec.decode(q)
+        for k in range(m*n):
+            acc += abs(l1[k] - l2[k])
         return acc
 
-def supnorm(p,q,m,n):
-    g = Grid(1,1)
-    g1 = g.id_to_grid(p,m,n)
-    g2 = g.id_to_grid(q,m,n)
-    m = 0
-    for i in range(m):
-            for j in range(n):
-                v = abs(g1.state[i][j] - g2.state[i][j])
-                if v > m:
-                    m = v
-    return m
-
-def maxswap_h(p,q,m,n): # Heuristique qui renvoie le nombre maximal de swaps à faire pour mettre un nombre à la bonne place dans la grid
-    g = Grid(1,1)
-    g1 = g.id_to_grid(p,m,n)
-    g2 = g.id_to_grid(q,m,n)
+def supnorm(p,q,m,n,codec=None):
+    if codec is None:
+        codec = get_codec(m,n)
+    l1 = codec.decode(p)
+    l2 = codec.decode(q)
+    sup = 0
+    for k in range(m*n):
+        v = abs(l1[k] - l2[k])
+        if v > sup:
+            sup = v
+    return sup
+
+def maxswap_h(p,q,m,n,codec=None): # Heuristique qui renvoie le nombre maximal de swaps à faire pour mettre un nombre à la bonne place dans la grid
+    if codec is None:
+        codec = get_codec(m,n)
+    l1 = codec.decode(p)
+    l2 = codec.decode(q)
     h = 0
     for i in range(m):
         for j in range(n):
-            v = g1.state[i][j]
+            v = l1[i*n+j]
             for k in range(m):
                 for l in range(n):
-                    if g2.state[k][l] == v:
+                    if l2[k*n+l] == v:
                         val = abs(i-k) + abs(j-l)
                         if val > h:
                             h = val
     return h
 
-def hash_h(p,q,m,n): # Utiliser la fonction de hash elle même comme heuristique par différence
-    return p-q
\ No newline at end of file
+def hash_h(p,q,m,n,codec=None): # Utiliser la fonction de hash elle même comme heuristique par différence
+    if codec is not None: # La différence n'a de sens que pour les identifiants en base m*n+1
+        base = get_codec(m,n)
+        p, q = base.encode(codec.decode(p)), base.encode(codec.decode(q))
+    return p-q
+
+
+class IncrementalHeuristic():
+    """
+    An admissible heuristic for the sorted grid as goal, computed on the decoded state (the flattened grid) and updated
+    after each swap instead of being computed again from scratch.
+
+    It keeps three components for each state:
+    - the sum over the tiles of the Manhattan distance to their goal cell (a swap moves two tiles by one cell, so half of
+      it is a lower bound), updated in O(1) with the table of the goal positions
+    - the number of inversions when reading the grid line by line, which a horizontal swap changes by exactly 1 and a
+      vertical swap by at most 2n-1 (update in O(n) for a vertical swap, O(1) otherwise)
+    - the number of inversions when reading the grid column by column, the same with the roles of m and n exchanged
+    The parity of the number of inversions is also the parity of the number of swaps still needed, so the bound is rounded
+    up to the right parity.
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    cost: list[list[int]]
+        cost[v][c] is the Manhattan distance between the cell c (flat index) and the goal cell of the tile v
+    """
+
+    admissible = True # Les solveurs peuvent considérer les solutions obtenues comme optimales
+
+    def __init__(self, m, n):
+        self.m = m
+        self.n = n
+        self.cost = [[0]*(m*n)] + [[abs(c//n - (v-1)//n) + abs(c%n - (v-1)%n) for c in range(m*n)] for v in range(1, m*n+1)]
+        self.col = [(c%n)*m + c//n for c in range(m*n)] # Position de chaque case dans la lecture colonne par colonne
+        self.col_to_cell = [0]*(m*n)
+        for c in range(m*n):
+            self.col_to_cell[self.col[c]] = c
+        self.label = [0] + [self.col[v-1] for v in range(1, m*n+1)] # Rang de la case but de v dans cette lecture
+
+    def __repr__(self):
+        return f"<heuristics.IncrementalHeuristic: m={self.m}, n={self.n}>"
+
+    def init(self, l):
+        """
+        Computes the components (tile distance, line inversions, column inversions) of the flattened state l.
+        """
+        cost = self.cost
+        D = sum(cost[v][c] for c, v in enumerate(l))
+        I = inversions(l)
+        J = inversions([self.label[l[c]] for c in self.col_to_cell]) # La grid triée n'a aucune inversion dans cette lecture
+        return (D, I, J)
+
+    def update(self, l, comps, a, b):
+        """
+        Returns the components of the state obtained by swapping the cells a < b (flat indices) of the state l, whose
+        components are comps. l itself is not modified.
+        """
+        D, I, J = comps
+        x, y = l[a], l[b]
+        cost = self.cost
+        D += cost[x][b] + cost[y][a] - cost[x][a] - cost[y][b]
+        I += swap_inversions(l, a, b)
+        col, col_to_cell, label = self.col, self.col_to_cell, self.label
+        ca, cb = col[a], col[b]
+        if ca+1 == cb: # Swap vertical : cases voisines dans la lecture colonne par colonne
+            J += 1 if label[x] < label[y] else -1
+        else:
+            between = [label[l[col_to_cell[k]]] for k in range(ca+1, cb)]
+            J += swap_delta(label[x], label[y], between)
+        return (D, I, J)
+
+    def value(self, comps):
+        """
+        Returns the heuristic of a state from its components.
+        """
+        D, I, J = comps
+        h = max((D+1)//2, -(-I//(2*self.n-1)), -(-J//(2*self.m-1)))
+        if (h - I) % 2 == 1: # Chaque swap change la parité du nombre d'inversions, qui vaut 0 pour la grid triée
+            h += 1
+        return h
+
+    def __call__(self, p, q, m, n, codec=None):
+        """
+        Heuristic in the format of the functions above, computed from scratch. The goal q must be the sorted grid.
+        """
+        if codec is None:
+            codec = get_codec(m,n)
+        return self.value(self.init(codec.decode(p)))
+
+def inversions(l): # Nombre de couples i < j avec l[i] > l[j], en O(len(l) log(len(l))) par tri fusion
+    if len(l) <= 1:
+        return 0
+    count = 0
+    def sort(l):
+        nonlocal count
+        if len(l) <= 1:
+            return l
+        left, right = sort(l[:len(l)//2]), sort(l[len(l)//2:])
+        merged = []
+        i = j = 0
+        while i < len(left) and j < len(right):
+            if left[i] <= right[j]:
+                merged.append(left[i])
+                i += 1
+            else:
+                merged.append(right[j])
+                count += len(left) - i
+                j += 1
+        return merged + left[i:] + right[j:]
+    sort(list(l))
+    return count
+
+def swap_delta(x, y, between): # Variation du nombre d'inversions quand on échange x et y séparés par les valeurs between
+    if x < y:
+        return 1 + 2*sum(1 for v in between if x < v < y)
+    return -1 - 2*sum(1 for v in between if y < v < x)
+
+def swap_inversions(l, a, b): # Variation du nombre d'inversions de la lecture ligne par ligne quand on échange l[a] et l[b]
+    if b == a+1:
+        return 1 if l[a] < l[b] else -1
+    return swap_delta(l[a], l[b], l[a+1:b])
@@ -0,0 +1,141 @@
+"""
+This is the implicit BFS module. It contains a breadth-first search over the graph of the states of a grid that never
+builds the graph: states are indexed by their permutation rank and neighbours are generated on the fly.
+"""
+
+import time
+from collections import deque
+from codec import get_codec
+
+NO_MOVE = 255 # Valeur de moves pour la racine (et les états non visités)
+
+class ImplicitBFS():
+    """
+    A breadth-first search over the (m*n)! states of a m*n grid. Memory is proportional to the number of states and not to
+    the range of the identifiers: one bit per state for the visited set and one byte per state for the parent pointer.
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    codec: RankCodec
+        The codec giving the rank (0..(m*n)!-1) of a state, used as index in the arrays below
+    nb_states: int
+        The number of states, (m*n)!
+    visited: bytearray
+        Bitmap of the visited states, bit r % 8 of visited[r // 8] is set once the state of rank r has been reached
+    moves: bytearray
+        moves[r] is the index (in codec.edges) of the swap that led to the state of rank r, NO_MOVE for the source. Since a
+        swap is its own inverse, applying it again to r gives the parent of r.
+    """
+
+    def __init__(self, m, n):
+        """
+        Initializes the search for grids of shape m*n (allocates (m*n)!/8 + (m*n)! bytes).
+        """
+        self.m = m
+        self.n = n
+        self.codec = get_codec(m, n, "rank")
+        if len(self.codec.edges) >= NO_MOVE:
+            raise ValueError("Too many moves to store them on one byte")
+        self.nb_states = self.codec.nb_states
+        self.visited = bytearray((self.nb_states+7)//8)
+        self.moves = bytearray([NO_MOVE])*self.nb_states
+        self.src = None
+
+    def __repr__(self):
+        """
+        Returns a representation of the search with the shape of the grid.
+        """
+        return f"<implicit_bfs.ImplicitBFS: m={self.m}, n={self.n}, nb_states={self.nb_states}>"
+
+    def is_visited(self, r):
+        """
+        Returns True if the state of rank r has been reached by the search.
+        """
+        return self.visited[r >> 3] >> (r & 7) & 1 == 1
+
+    def run(self, src, dst=None, stats=None):
+        """
+        Runs the BFS from the state of rank src. If dst is given, stops as soon as the state of rank dst is reached,
+        otherwise explores the whole connected component. stats is an optional SearchStats (see search_stats.py) filled by
+        the search.
+
+        Output:
+        -------
+        found: bool
+            True if dst has been reached (always True when dst is None)
+        """
+        visited, moves = self.visited, self.moves
+        neighbours = self.codec.neighbours
+        self.src = src
+        visited[src >> 3] |= 1 << (src & 7)
+        on = stats is not None
+        if on:
+            start = time.perf_counter()
+            expanded = generated = 0
+            max_open = 1
+        found = src == dst
+        queue = deque([] if found else [src])
+        while queue and not found:
+            v = queue.popleft()
+            nbrs = neighbours(v)
+            for ne, k in nbrs:
+                if not visited[ne >> 3] >> (ne & 7) & 1:
+                    visited[ne >> 3] |= 1 << (ne & 7)
+                    moves[ne] = k
+                    if ne == dst:
+                        found = True
+                        break
+                    queue.append(ne)
+            if on: # Compteurs locaux, copiés dans stats à la fin
+                expanded += 1
+                generated += len(nbrs)
+                if len(queue) > max_open:
+                    max_open = len(queue)
+                if stats.callback is not None and expanded % stats.sample == 0:
+                    stats.callback(v, None, None, len(queue))
+        if on:
+            stats.expanded += expanded
+            stats.generated += generated
+            stats.max_open = max(stats.max_open, max_open)
+            stats.time_total += time.perf_counter() - start
+        return found or dst is None
+
+    def get_moves(self, dst):
+        """
+        Returns the list of the indices of the swaps leading from the source of the search to the state of rank dst.
+        """
+        codec = self.codec
+        move_list = []
+        l = codec.decode(dst)
+        cur_node = dst
+        while self.moves[cur_node] != NO_MOVE: # On remonte en réappliquant le swap qui a mené à chaque état
+            k = self.moves[cur_node]
+            a, b = codec.edges[k]
+            l[a], l[b] = l[b], l[a]
+            cur_node = codec.encode(l)
+            move_list.append(k)
+        move_list.reverse()
+        return move_list
+
+    def get_path(self, dst):
+        """
+        Returns the list of the ranks of the states from the source of the search to the state of rank dst.
+        """
+        codec = self.codec
+        path = [self.src]
+        l = codec.decode(self.src)
+        for k in self.get_moves(dst):
+            a, b = codec.edges[k]
+            l[a], l[b] = l[b], l[a]
+            path.append(codec.encode(l))
+        return path
+
+    def get_swaps(self, dst):
+        """
+        Returns the swaps (in the format of Grid.swap_seq) leading from the source of the search to the state of rank dst.
+        """
+        return [self.codec.swaps[k] for k in self.get_moves(dst)]
@@ -0,0 +1,197 @@
+"""
+This is the loaders module. It reads the grid and graph files in one pass with numpy, and converts them to a binary format
+that is loaded by memory mapping.
+
+The text formats are those of Grid.grid_from_file ("m n", then m lines of n integers) and Graph.graph_from_file ("n m",
+then m lines "node1 node2"). The binary formats are a header followed by an array of little-endian int32:
+- grid: magic b"SWGR", then m and n (uint32), then the m*n values line by line
+- graph: magic b"SWGE", then n and m (uint32), then the 2*m ends of the edges
+- corpus of grids (see generator.py): magic b"SWGC", then m and n (uint32), then one record per grid: its m*n values
+  line by line followed by its distance to the sorted grid (the number of records is given by the size of the file)
+"""
+
+import sys
+import struct
+import numpy as np
+
+HEADER = struct.Struct("<4sII")
+GRID_MAGIC = b"SWGR"
+GRAPH_MAGIC = b"SWGE"
+CORPUS_MAGIC = b"SWGC"
+INT = np.dtype("<i4")
+
+def _scan_lines(buff, nb_lines):
+    """
+    Returns the number of integers on each of the nb_lines first lines of buff (bytes), 0 for the missing lines, and the
+    position of the end of these lines in buff.
+    """
+    b = np.frombuffer(buff, dtype=np.uint8)
+    newline = b == ord("\n")
+    blank = newline | (b == ord(" ")) | (b == ord("\t")) | (b == ord("\r"))
+    starts = np.flatnonzero(~blank & np.concatenate(([True], blank[:-1]))) # Début de chaque entier
+    line = np.cumsum(newline)[starts] # Numéro de ligne de chaque entier
+    ends = np.flatnonzero(newline)
+    end = int(ends[nb_lines-1]) if len(ends) >= nb_lines else len(buff) # Le reste du fichier est ignoré
+    return np.bincount(line[line < nb_lines], minlength=nb_lines), end
+
+def _read_text(file_name, shape):
+    """
+    Reads a text file made of a header line "a b" followed by lines of integers. shape(a, b) gives the number of these
+    lines and the number of integers expected on each of them, Exception("Format incorrect") is raised otherwise (as
+    Grid.grid_from_file and Graph.graph_from_file do). Returns a, b and the array of the integers.
+    """
+    with open(file_name, "rb") as file:
+        a, b = map(int, file.readline().split())
+        buff = file.read()
+    nb_lines, per_line = shape(a, b)
+    if nb_lines == 0:
+        return a, b, np.empty(0, dtype=np.int64)
+    counts, end = _scan_lines(buff, nb_lines)
+    if (counts != per_line).any():
+        raise Exception("Format incorrect")
+    return a, b, np.fromstring(buff[:end].decode(), dtype=np.int64, sep=" ") # Analyse en C, en une seule passe
+
+def read_grid_text(file_name):
+    """
+    Reads a grid text file in one pass, returns m, n and the array of the m*n values line by line.
+    """
+    return _read_text(file_name, lambda m, n: (m, n))
+
+def read_graph_text(file_name):
+    """
+    Reads a graph text file in one pass, returns the number of nodes n and the (m, 2) array of the edges.
+    """
+    n, m, data = _read_text(file_name, lambda n, m: (m, 2))
+    return n, data.reshape(m, 2)
+
+def _write_binary(file_name, magic, a, b, data):
+    with open(file_name, "wb") as file:
+        file.write(HEADER.pack(magic, a, b))
+        file.write(np.ascontiguousarray(data, dtype=INT).tobytes())
+
+def _read_binary(file_name, magic, size):
+    """
+    Reads the header of a binary file and maps its array in memory (no copy, read-only). size(a, b) is the length of the
+    array given the header.
+    """
+    with open(file_name, "rb") as file:
+        header = file.read(HEADER.size)
+        file.seek(0, 2)
+        file_size = file.tell()
+    if len(header) != HEADER.size:
+        raise Exception("Format incorrect")
+    found, a, b = HEADER.unpack(header)
+    if found != magic or file_size != HEADER.size + size(a, b)*INT.itemsize:
+        raise Exception("Format incorrect")
+    if size(a, b) == 0:
+        return a, b, np.empty(0, dtype=INT)
+    return a, b, np.memmap(file_name, dtype=INT, mode="r", offset=HEADER.size, shape=(size(a, b),))
+
+def write_grid_binary(file_name, m, n, cells):
+    """
+    Writes a grid in the binary format, cells being the m*n values line by line.
+    """
+    _write_binary(file_name, GRID_MAGIC, m, n, cells)
+
+def read_grid_binary(file_name):
+    """
+    Loads a binary grid file, returns m, n and the memory-mapped array of the values.
+    """
+    return _read_binary(file_name, GRID_MAGIC, lambda m, n: m*n)
+
+def write_graph_binary(file_name, n, edges):
+    """
+    Writes a graph in the binary format, edges being the (m, 2) array of the edges.
+    """
+    edges = np.asarray(edges).reshape(-1, 2)
+    _write_binary(file_name, GRAPH_MAGIC, n, len(edges), edges)
+
+def read_graph_binary(file_name):
+    """
+    Loads a binary graph file, returns the number of nodes and the memory-mapped (m, 2) array of the edges.
+    """
+    n, m, data = _read_binary(file_name, GRAPH_MAGIC, lambda n, m: 2*m)
+    return n, data.reshape(m, 2)
+
+def read_corpus_binary(file_name):
+    """
+    Loads a corpus file, returns m, n and the memory-mapped (count, m*n+1) array of the records: the values of each grid
+    then its distance.
+    """
+    with open(file_name, "rb") as file:
+        header = file.read(HEADER.size)
+        file.seek(0, 2)
+        file_size = file.tell()
+    if len(header) != HEADER.size:
+        raise Exception("Format incorrect")
+    found, m, n = HEADER.unpack(header)
+    record = (m*n+1)*INT.itemsize
+    if found != CORPUS_MAGIC or (file_size - HEADER.size) % record != 0:
+        raise Exception("Format incorrect")
+    count = (file_size - HEADER.size) // record
+    if count == 0:
+        return m, n, np.empty((0, m*n+1), dtype=INT)
+    return m, n, np.memmap(file_name, dtype=INT, mode="r", offset=HEADER.size, shape=(count, m*n+1))
+
+def is_binary(file_name, magic):
+    """
+    Tells whether file_name starts with the given magic number.
+    """
+    with open(file_name, "rb") as file:
+        return file.read(len(magic)) == magic
+
+def read_grid(file_name):
+    """
+    Reads a grid file in the text or in the binary format, returns m, n and the array of the values.
+    """
+    if is_binary(file_name, GRID_MAGIC):
+        return read_grid_binary(file_name)
+    return read_grid_text(file_name)
+
+def read_graph(file_name):
+    """
+    Reads a graph file in the text or in the binary format, returns the number of nodes and the array of the edges.
+    """
+    if is_binary(file_name, GRAPH_MAGIC):
+        return read_graph_binary(file_name)
+    return read_graph_text(file_name)
+
+def grid_to_binary(text_file, binary_file):
+    """
+    Converts a grid text file to the binary format.
+    """
+    m, n, cells = read_grid_text(text_file)
+    write_grid_binary(binary_file, m, n, cells)
+
+def grid_to_text(binary_file, text_file):
+    """
+    Converts a binary grid file to the text format.
+    """
+    m, n, cells = read_grid_binary(binary_file)
+    with open(text_file, "w") as file:
+        file.write(f"{m} {n}\n")
+        for i in range(m):
+            file.write(" ".join(map(str, cells[i*n:(i+1)*n].tolist())) + "\n")
+
+def graph_to_binary(text_file, binary_file):
+    """
+    Converts a graph text file to the binary format.
+    """
+    n, edges = read_graph_text(text_file)
+    write_graph_binary(binary_file, n, edges)
+
+def graph_to_text(binary_file, text_file):
+    """
+    Converts a binary graph file to the text format.
+    """
+    n, edges = read_graph_binary(binary_file)
+    with open(text_file, "w") as file:
+        file.write(f"{n} {len(edges)}\n")
+        np.savetxt(file, edges, fmt="%d")
+
+CONVERSIONS = {("grid", "binary"): grid_to_binary, ("grid", "text"): grid_to_text,
+               ("graph", "binary"): graph_to_binary, ("graph", "text"): graph_to_text}
+
+if __name__ == "__main__": # Conversion : python swap_puzzle/loaders.py grid|graph binary|text entrée sortie
+    kind, target, src, dst = sys.argv[1:5]
+    CONVERSIONS[(kind, target)](src, dst)
@@ -1,12 +1,57 @@
-from grid import Grid
+"""
+Solves a batch of grid files in parallel, for instance from the root folder:
 
-g = Grid(2, 3)
-print(g)
+    python swap_puzzle/main.py "input/grid*.in" --workers 4 --timeout 10 --out-dir output/
 
-data_path = "../input/"
-file_name = data_path + "grid0.in"
+A summary line (JSON) is printed for each grid as soon as it is solved.
+"""
 
-print(file_name)
+import os
+import sys
+import json
+import time
+import argparse
+from batch import solve_batch, expand_paths, METHODS
 
-g = Grid.grid_from_file(file_name)
-print(g)
\ No newline at end of file
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve swap puzzle grid files in parallel.")
+    parser.add_argument("paths", nargs="+", help="grid files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: number of cores)")
+    parser.add_argument("--timeout", type=float, default=None, help="time limit per grid, in seconds")
+    parser.add_argument("--method", choices=sorted(METHODS), default="ida", help="solver used for each grid")
+    parser.add_argument("--out-dir", default=None, help="directory of the .out files (default: next to the grids)")
+    parser.add_argument("--table-dir", default=None, help="directory of the precomputed distance tables")
+    parser.add_argument("--cache-file", default=None, help="SQLite file of the solution cache shared by the workers")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for p in args.paths:
+        paths += [p] if os.path.isfile(p) else expand_paths(p)
+    if not paths:
+        print(f"error: no grid file matches {' '.join(args.paths)}", file=sys.stderr)
+        return 2
+    totals = {"grids": 0, "solved": 0, "swaps": 0, "nodes": 0, "time": 0.}
+    start = time.perf_counter()
+    for summary in solve_batch(paths, args.workers, args.method, args.timeout, args.out_dir, args.table_dir,
+                               args.cache_file):
+        print(json.dumps(summary), flush=True)
+        totals["grids"] += 1
+        totals["nodes"] += summary["nodes"]
+        if "cache" in summary:
+            cache = totals.setdefault("cache", {"hits": 0, "misses": 0})
+            cache["hits"] += summary["cache"]["hits"]
+            cache["misses"] += summary["cache"]["misses"]
+            cache["entries"] = max(cache.get("entries", 0), summary["cache"]["entries"]) # Le fichier est partagé
+            cache["size_bytes"] = max(cache.get("size_bytes", 0), summary["cache"]["size_bytes"])
+        if summary["status"] == "ok":
+            totals["solved"] += 1
+            totals["swaps"] += summary["swaps"]
+    totals["time"] = time.perf_counter() - start # Temps réel du lot : les grids sont résolues en parallèle
+    if "cache" in totals:
+        lookups = totals["cache"]["hits"] + totals["cache"]["misses"]
+        totals["cache"]["hit_rate"] = totals["cache"]["hits"]/lookups if lookups else 0.
+    print(json.dumps({"total": totals}), flush=True)
+    return 0 if totals["solved"] == totals["grids"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
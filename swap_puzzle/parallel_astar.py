@@ -0,0 +1,195 @@
+"""
+This is the parallel A* module. It contains hda_star, a hash-distributed A* (HDA*) that spreads one search over several
+processes.
+
+Each state is owned by one worker, chosen by hashing its key (crc32 of the key of the codec "packed"): only the owner
+keeps its distance and its parent, and only the owner expands it. A worker expands the states of its own open list and
+sends the neighbours owned by the other workers to them, in batches, over multiprocessing queues. When the goal is
+reached, its cost becomes the shared incumbent and the states with f = g + h at least the incumbent are no longer
+expanded: with an admissible heuristic the incumbent is optimal once no worker has anything left to expand and no
+batch is in transit. This is detected by the main process with two consecutive identical reads of the counters of sent
+and received batches while all the workers are idle. The path is then rebuilt by asking each owner for the parent of
+its states.
+"""
+
+import zlib
+import queue
+import functools
+import multiprocessing
+from array import array
+from codec import get_codec
+from graph import BucketQueue
+from heuristics import IncrementalHeuristic
+
+INFINITY = 2**31 - 1
+POLL = 1. # Attente maximale (secondes) d'une réponse d'un processus avant de vérifier qu'il est toujours en vie
+
+def owner(key, workers):
+    """
+    Returns the index of the worker that owns the state key (key of the codec "packed").
+    """
+    if not isinstance(key, bytes): # Grandes grids : la clé est un tuple
+        key = array("H", key).tobytes()
+    return zlib.crc32(key) % workers
+
+def _worker(i, workers, src, dst, m, n, h, inboxes, controls, replies, incumbent, sent, received, idle, expanded, stop,
+            batch, chunk):
+    """
+    The loop of the worker i (see the module docstring), then the service of the parents of its states until it is told
+    to quit.
+    """
+    codec = get_codec(m, n, "packed")
+    incremental = isinstance(h, IncrementalHeuristic) # Les composantes voyagent avec les sommets, calculées par l'expanseur
+    if not incremental:
+        h = functools.partial(h, codec=codec)
+    inbox = inboxes[i]
+    open_list = BucketQueue()
+    dist = {}
+    prev = {} # Sommet -> (parent, indice du swap), seulement pour les sommets dont ce processus est le propriétaire
+    closed = set()
+    comps = {} # Composantes de l'heuristique incrémentale des sommets possédés
+    out = [[] for _ in range(workers)] # Sommets à envoyer à chaque propriétaire
+    nb_expanded = 0
+
+    def reach(key, g, parent, k, c): # Un sommet dont on est le propriétaire est atteint avec le coût g (c : ses composantes)
+        if key in dist and dist[key] <= g:
+            return
+        dist[key] = g
+        prev[key] = (parent, k)
+        closed.discard(key)
+        if key == dst:
+            with incumbent.get_lock():
+                if g < incumbent.value:
+                    incumbent.value = g
+            return
+        if incremental:
+            comps[key] = c
+            f = g + h.value(c)
+        else:
+            f = g + h(key, dst, m, n)
+        if f < incumbent.value:
+            open_list.push(f, g, key)
+
+    def flush(j):
+        sent[i] += 1 # Compté avant l'envoi : un lot en transit rend les compteurs différents
+        inboxes[j].put(out[j])
+        out[j] = []
+
+    if owner(src, workers) == i:
+        reach(src, 0, None, -1, h.init(codec.decode(src)) if incremental else None)
+    while not stop.is_set():
+        while True: # Lots reçus des autres processus
+            try:
+                message = inbox.get_nowait() if len(open_list) > 0 else inbox.get(timeout=0.005)
+            except queue.Empty:
+                break
+            idle[i] = 0
+            for key, g, parent, k, c in message:
+                reach(key, g, parent, k, c)
+            received[i] += 1
+        for _ in range(chunk):
+            if len(open_list) == 0:
+                break
+            f, g, key = open_list.pop()
+            if key in closed or g != dist[key]: # Entrée périmée
+                continue
+            if f >= incumbent.value: # Aucun sommet restant ne peut améliorer la solution connue
+                open_list = BucketQueue()
+                break
+            closed.add(key)
+            nb_expanded += 1
+            if incremental:
+                l = codec.decode(key)
+            c = None
+            for ne, k in codec.neighbours(key):
+                if incremental:
+                    a, b = codec.edges[k]
+                    c = h.update(l, comps[key], a, b)
+                j = owner(ne, workers)
+                if j == i:
+                    reach(ne, g+1, key, k, c)
+                else:
+                    out[j].append((ne, g+1, key, k, c))
+                    if len(out[j]) >= batch:
+                        flush(j)
+        expanded[i] = nb_expanded
+        for j in range(workers): # Envoi après chaque tranche : les propriétaires voient vite les bons sommets
+            if out[j]:
+                flush(j)
+        if len(open_list) == 0:
+            idle[i] = 1
+    while True: # Reconstruction du chemin : le processus principal demande les parents des sommets
+        message = controls[i].get()
+        if message[0] == "quit":
+            return
+        replies.put(prev[message[1]])
+
+def _check(processes, stopped=False):
+    """
+    Raises RuntimeError if a worker failed. Once the search is stopped (stopped True) the workers only wait for the
+    requests of parents, so a worker that exited, even normally, failed too.
+    """
+    if any(p.exitcode is not None and (stopped or p.exitcode != 0) for p in processes):
+        raise RuntimeError("A worker of the parallel A* failed")
+
+def hda_star(src, dst, m, n, h, workers=None, batch=256, chunk=64):
+    """
+    Hash-distributed parallel A* from src to dst (keys of the codec "packed" of the m*n grids) with workers processes
+    (default: number of cores). h is a heuristic in the format of heuristics.py; it must be picklable (a function of a
+    module, an IncrementalHeuristic or a PatternDatabase) and admissible for the solution to be optimal. The neighbours
+    are sent to their owners by batches of batch states, and each worker reads its inbox every chunk expansions.
+
+    Output:
+    -------
+    moves: list[int] | None
+        The indices (in codec.edges) of the swaps of an optimal path, None if dst cannot be reached
+    expanded: int
+        The total number of states expanded by the workers
+    """
+    if src == dst:
+        return [], 0
+    workers = workers or multiprocessing.cpu_count()
+    inboxes = [multiprocessing.Queue() for _ in range(workers)]  # Lots de sommets
+    controls = [multiprocessing.Queue() for _ in range(workers)] # Demandes de parents, puis fin
+    replies = multiprocessing.Queue()
+    incumbent = multiprocessing.Value("q", INFINITY)
+    sent, received, idle, expanded = (multiprocessing.Array("q", workers, lock=False) for _ in range(4))
+    stop = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_worker, args=(i, workers, src, dst, m, n, h, inboxes, controls, replies,
+                                                               incumbent, sent, received, idle, expanded, stop, batch,
+                                                               chunk))
+                 for i in range(workers)]
+    for p in processes:
+        p.start()
+    try:
+        previous = None
+        while True: # Détection de la terminaison : deux lectures identiques, tous les processus inactifs
+            stop.wait(0.01)
+            _check(processes)
+            state = (list(idle), list(sent), list(received))
+            done = all(state[0]) and sum(state[1]) == sum(state[2])
+            if done and state == previous:
+                break
+            previous = state if done else None
+        stop.set()
+        moves = None
+        if incumbent.value < INFINITY:
+            moves = []
+            node = dst
+            while node != src:
+                controls[owner(node, workers)].put(("trace", node))
+                while True:
+                    try:
+                        node, k = replies.get(timeout=POLL)
+                        break
+                    except queue.Empty: # Un processus mort ne répondra jamais
+                        _check(processes, stopped=True)
+                moves.append(k)
+            moves.reverse()
+        return moves, sum(expanded)
+    finally:
+        stop.set()
+        for control in controls:
+            control.put(("quit",))
+        for p in processes:
+            p.join()
@@ -0,0 +1,183 @@
+"""
+This is the pattern database module. It contains the PatternDatabase class, an additive heuristic built from exact
+distances computed on projections of the grid onto disjoint groups of tiles.
+"""
+
+import os
+import numpy as np
+from codec import get_codec
+from symmetry import cell_symmetries
+
+UNREACHED = 255
+
+def default_groups(m, n):
+    """
+    Returns the default partition of the tiles 1..m*n: the lines of the grid, cut in groups of at most 4 tiles so that
+    each table has at most (m*n)**4 entries.
+    """
+    groups = []
+    for i in range(m):
+        line = list(range(i*n+1, (i+1)*n+1))
+        for j in range(0, n, 4):
+            groups.append(line[j:j+4])
+    return groups
+
+class PatternDatabase():
+    """
+    An admissible heuristic for the swap puzzle made of one pattern database per group of tiles. The projection of a
+    state on a group only keeps the positions of the tiles of the group. In the projection a swap costs 1 per tile of the
+    group it moves, so that summing over disjoint groups counts every tile move once: since one swap moves two tiles, half
+    of the sum is a lower bound of the number of swaps.
+
+    The tables are indexed by the positions (p_0, ..., p_k-1) of the tiles of the group written in base m*n. When symmetric
+    is True, a group that is the image of a previous group by a symmetry of the grid (see symmetry.py), like the last line
+    and the first one, shares the table of that group, read through the symmetry: only half of the tables (a quarter for
+    the columns of a square grid) are computed and stored.
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    groups: list[list[int]]
+        The disjoint groups of tiles
+    tables: list[numpy.ndarray]
+        tables[i] is the array of uint8 of the number of moves of tiles of groups[i] needed to put them in place
+    mirrors: list[tuple | None]
+        mirrors[i] is None if groups[i] has its own table, else (j, order, s): tables[i] is tables[j], and the tile order[r]
+        of groups[i] at the cell c plays the role of the tile groups[j][r] at the cell s[c]
+    """
+
+    admissible = True # Les solveurs peuvent considérer les solutions obtenues comme optimales
+
+    def __init__(self, m, n, groups=None, tables=None, symmetric=True):
+        """
+        Initializes the database. If tables is not given, they are computed (see build_table).
+        """
+        self.m = m
+        self.n = n
+        self.groups = groups if groups is not None else default_groups(m, n)
+        seen = [t for group in self.groups for t in group]
+        if len(seen) != len(set(seen)) or not all(1 <= t <= m*n for t in seen):
+            raise ValueError("The groups must be disjoint sets of tiles of the grid")
+        self.powers = [[(m*n)**i for i in range(len(group))] for group in self.groups]
+        self.mirrors = [None]*len(self.groups)
+        if symmetric:
+            for i, group in enumerate(self.groups):
+                for j in range(i):
+                    if self.mirrors[j] is not None: # Seuls les groupes qui ont leur propre table servent de source
+                        continue
+                    mirror = self.mirror(self.groups[j], group)
+                    if mirror is not None:
+                        self.mirrors[i] = (j,) + mirror
+                        break
+        if tables is None:
+            tables = [self.build_table(group) if mirror is None else None
+                      for group, mirror in zip(self.groups, self.mirrors)]
+        self.tables = self.share(tables)
+
+    def mirror(self, source, group):
+        """
+        Returns (order, s) if group is the image of the group source by the symmetry s of the cells (order being the images
+        of the tiles of source, in the same order), None otherwise.
+        """
+        for s in cell_symmetries(self.m, self.n)[1:]:
+            order = [s[t-1]+1 for t in source]
+            if sorted(order) == sorted(group):
+                return order, s
+        return None
+
+    def share(self, tables):
+        """
+        Replaces the tables of the mirrored groups by the tables they read (the same arrays, not copies).
+        """
+        return [table if mirror is None else tables[mirror[0]] for table, mirror in zip(tables, self.mirrors)]
+
+    def __repr__(self):
+        """
+        Returns a representation of the database with the shape of the grid and the groups.
+        """
+        return f"<pattern_database.PatternDatabase: m={self.m}, n={self.n}, groups={self.groups}>"
+
+    def build_table(self, group):
+        """
+        Computes the table of a group by a shortest path search from the goal positions of its tiles. Moves cost 1 or 2
+        (number of tiles of the group moved), each cost level is handled as a whole with numpy.
+        """
+        N = self.m*self.n
+        k = len(group)
+        codec = get_codec(self.m, self.n)
+        powers = np.array([N**i for i in range(k)], dtype=np.int64)
+        dist = np.full(N**k, UNREACHED, dtype=np.uint8)
+        buckets = {0: [np.array([sum((t-1)*N**i for i, t in enumerate(group))], dtype=np.int64)]}
+        c = 0
+        while buckets:
+            if c not in buckets:
+                c += 1
+                continue
+            nodes = np.unique(np.concatenate(buckets.pop(c)))
+            nodes = nodes[dist[nodes] == UNREACHED] # Les autres ont déjà une distance plus petite
+            dist[nodes] = c
+            pos = (nodes[:, None] // powers) % N # Positions des tuiles du groupe dans chaque état
+            for a, b in codec.edges:
+                in_a, in_b = pos == a, pos == b
+                cost = in_a.any(axis=1).astype(np.int64) + in_b.any(axis=1) # Nombre de tuiles du groupe déplacées
+                ne = (np.where(in_a, b, np.where(in_b, a, pos))*powers).sum(axis=1)
+                for w in (1, 2): # Un swap qui ne touche pas le groupe (coût 0) ne change pas la projection
+                    sel = ne[cost == w]
+                    sel = sel[dist[sel] == UNREACHED]
+                    if len(sel) > 0:
+                        buckets.setdefault(c+w, []).append(sel)
+            c += 1
+        return dist
+
+    def table_files(self, table_dir):
+        """
+        Returns the names of the files of the tables in the directory table_dir.
+        """
+        return [os.path.join(table_dir, f"pdb_{self.m}x{self.n}_" + "-".join(map(str, group)) + ".npy")
+                for group in self.groups]
+
+    def save(self, table_dir):
+        """
+        Saves the tables in table_dir, one .npy file per group.
+        """
+        os.makedirs(table_dir, exist_ok=True)
+        for file_name, table, mirror in zip(self.table_files(table_dir), self.tables, self.mirrors):
+            if mirror is None: # Les tables partagées ne sont écrites qu'une fois
+                np.save(file_name, table)
+
+    @classmethod
+    def load(cls, table_dir, m, n, groups=None, symmetric=True):
+        """
+        Loads tables saved with save. The files are memory-mapped, so only the pages that are read are loaded.
+        """
+        pdb = cls(m, n, groups, tables=[], symmetric=symmetric)
+        pdb.tables = pdb.share([np.load(f, mmap_mode="r") if mirror is None else None
+                                for f, mirror in zip(pdb.table_files(table_dir), pdb.mirrors)])
+        return pdb
+
+    def value(self, l):
+        """
+        Returns the heuristic of the flattened state l (list of the m*n values), for the sorted grid as goal.
+        """
+        pos = [0]*(len(l)+1)
+        for k, v in enumerate(l):
+            pos[v] = k
+        acc = 0
+        for group, powers, table, mirror in zip(self.groups, self.powers, self.tables, self.mirrors):
+            if mirror is None:
+                acc += int(table[sum(pos[t]*p for t, p in zip(group, powers))])
+            else: # Positions des tuiles du groupe dans l'image de l'état par la symétrie
+                j, order, s = mirror
+                acc += int(table[sum(s[pos[t]]*p for t, p in zip(order, powers))])
+        return (acc+1)//2 # Chaque swap déplace deux tuiles
+
+    def __call__(self, p, q, m, n, codec=None):
+        """
+        Heuristic in the format of heuristics.py, to be given to Graph.bfs_a_star. The goal q must be the sorted grid.
+        """
+        if codec is None:
+            codec = get_codec(m, n)
+        return self.value(codec.decode(p))
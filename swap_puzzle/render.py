@@ -0,0 +1,148 @@
+"""
+This is the render module. It draws grids and the solutions found by the solvers with matplotlib. It is only imported
+when something is drawn, so that solving grids never loads matplotlib.
+
+The solutions can be rendered to files without any display (non-interactive backend Agg), for instance from the root
+folder for the .out files written by main.py:
+
+    python swap_puzzle/render.py "input/grid*.in" --solution-dir output/ --out-dir renders/ --mode gif
+"""
+
+import os
+import sys
+import argparse
+
+def pyplot(interactive=True):
+    """
+    Imports and returns matplotlib.pyplot. If interactive is False the backend Agg is selected first, so that figures are
+    only written to files (this works without a display, e.g. in worker processes).
+    """
+    import matplotlib
+    if not interactive:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def draw_grid(ax, state, title="Grid :", highlight=None):
+    """
+    Draws the state (list of lists) of a grid on the axes ax, with the numbers of the cells. highlight is an optional swap
+    ((i1, j1), (i2, j2)) whose cells are circled.
+    """
+    m, n = len(state), len(state[0])
+    ax.imshow(state, cmap="plasma", interpolation="nearest", vmin=1, vmax=m*n) # Mêmes couleurs pour toute la solution
+    for i in range(m):
+        for j in range(n):
+            ax.text(j, i, state[i][j], ha="center", va="center", color="white")
+    if highlight is not None:
+        for i, j in highlight:
+            ax.add_patch(_circle((j, i)))
+    ax.set_title(title)
+    ax.axes.get_xaxis().set_visible(False) # Pour faire disparaitre les indices x et y qui ne servent pas
+    ax.axes.get_yaxis().set_visible(False)
+
+def _circle(center):
+    from matplotlib.patches import Circle
+    return Circle(center, 0.45, fill=False, edgecolor="white", linewidth=2)
+
+def show_grid(grid):
+    """
+    Displays the grid in a window (see Grid.show_grid).
+    """
+    plt = pyplot()
+    draw_grid(plt.gca(), grid.state)
+    plt.show()
+
+def solution_states(grid, swap_list):
+    """
+    Returns the list of the states (lists of lists) of the grid along the solution, from the initial state to the last one.
+    The grid is not modified.
+    """
+    g = grid.copy()
+    states = [[list(line) for line in g.state]]
+    for cell1, cell2 in swap_list:
+        g.swap(cell1, cell2)
+        states.append([list(line) for line in g.state])
+    return states
+
+def render_solution(grid, swap_list, out_dir, name="solution", mode="sheet", max_cols=8, fps=2):
+    """
+    Renders the solution swap_list of grid into out_dir and returns the list of the files written. mode is:
+    - "sheet": a single image name.png with one small grid per step (max_cols per line)
+    - "frames": one image per step, name_000.png, name_001.png, ...
+    - "gif": an animation name.gif (fps steps per second), written with Pillow
+    Each step shows the state before the swap, with its two cells circled.
+    """
+    plt = pyplot(interactive=False)
+    os.makedirs(out_dir, exist_ok=True)
+    states = solution_states(grid, swap_list)
+    swaps = list(swap_list) + [None] # Pas de swap après le dernier état
+    titles = [f"{k}/{len(swap_list)}" for k in range(len(states))]
+    if mode == "sheet":
+        cols = min(max_cols, len(states))
+        rows = -(-len(states)//cols)
+        fig, axes = plt.subplots(rows, cols, figsize=(2*cols, 2*rows), squeeze=False)
+        for ax in axes.flat[len(states):]:
+            ax.axis("off")
+        for ax, state, swap, title in zip(axes.flat, states, swaps, titles):
+            draw_grid(ax, state, title, swap)
+        files = [os.path.join(out_dir, f"{name}.png")]
+        fig.savefig(files[0])
+        plt.close(fig)
+        return files
+    if mode == "frames":
+        files = []
+        fig, ax = plt.subplots()
+        for k, (state, swap, title) in enumerate(zip(states, swaps, titles)):
+            ax.clear()
+            draw_grid(ax, state, title, swap)
+            files.append(os.path.join(out_dir, f"{name}_{k:03d}.png"))
+            fig.savefig(files[-1])
+        plt.close(fig)
+        return files
+    if mode == "gif":
+        from matplotlib.animation import FuncAnimation, PillowWriter
+        fig, ax = plt.subplots()
+        def frame(k):
+            ax.clear()
+            draw_grid(ax, states[k], titles[k], swaps[k])
+        animation = FuncAnimation(fig, frame, frames=len(states))
+        files = [os.path.join(out_dir, f"{name}.gif")]
+        animation.save(files[0], writer=PillowWriter(fps=fps))
+        plt.close(fig)
+        return files
+    raise ValueError(f"Unknown mode {mode}, expected sheet, frames or gif")
+
+def render_files(grid_files, solution_dir=None, out_dir="renders", mode="sheet"):
+    """
+    Renders the solutions written by batch.solve_batch for the grid files grid_files (the .out files are looked for in
+    solution_dir, or next to the grid files if it is None). The grids without a solution file are skipped. Returns the list
+    of the files written.
+    """
+    from grid import Grid
+    from batch import read_solution
+    files = []
+    for file_name in grid_files:
+        name = os.path.splitext(os.path.basename(file_name))[0]
+        solution = os.path.join(solution_dir if solution_dir is not None else os.path.dirname(file_name), name + ".out")
+        if not os.path.exists(solution):
+            continue
+        files += render_solution(Grid.grid_from_file(file_name), read_solution(solution), out_dir, name, mode)
+    return files
+
+def main(argv=None):
+    from batch import expand_paths
+    parser = argparse.ArgumentParser(description="Render the solutions of swap puzzle grid files.")
+    parser.add_argument("paths", nargs="+", help="grid files, directories or glob patterns")
+    parser.add_argument("--solution-dir", default=None, help="directory of the .out files (default: next to the grids)")
+    parser.add_argument("--out-dir", default="renders", help="directory of the rendered files")
+    parser.add_argument("--mode", choices=["sheet", "frames", "gif"], default="sheet", help="kind of rendering")
+    args = parser.parse_args(argv)
+    paths = []
+    for p in args.paths:
+        paths += [p] if os.path.isfile(p) else expand_paths(p)
+    for file_name in render_files(paths, args.solution_dir, args.out_dir, args.mode):
+        print(file_name)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
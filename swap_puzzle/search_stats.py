@@ -0,0 +1,89 @@
+"""
+This is the search statistics module. It contains the SearchStats class, the counters and timers filled by the searches
+(Graph.bfs_a_star, the BFS of Graph and CSRGraph, ImplicitBFS.run and Solver.get_solution_bidir) when they are given one,
+and the SearchResult class that the solver returns with a solution (Solver.get_solution_stats for the A*,
+Solver.get_solution_bidir_stats for the BFS).
+"""
+
+class SearchStats():
+    """
+    The statistics of a search. The counters cost a few integer additions per expanded node; the timers (timing=True)
+    call time.perf_counter around each heuristic evaluation, expansion and queue operation, which slows the search down.
+    A search without SearchStats does not pay for either.
+
+    Attributes:
+    -----------
+    generated: int
+        The number of neighbours generated by the expansions
+    expanded: int
+        The number of nodes expanded
+    reexpanded: int
+        The number of expansions of nodes that had already been expanded (inconsistent heuristic)
+    stale: int
+        The number of entries of the open list skipped because their node had been reached by a shorter path since
+    max_open: int
+        The maximal size of the open list
+    timing: bool
+        Whether the time_heuristic, time_expand and time_queue timers are measured
+    time_heuristic: float
+        Time spent computing the heuristic, in seconds
+    time_expand: float
+        Time spent generating the neighbours
+    time_queue: float
+        Time spent in the operations of the open list
+    time_total: float
+        Wall time of the search
+    callback: callable | None
+        Called as callback(node, g, f, open_size) on every sample-th expansion (a sampling tracer, f is None for the BFS)
+    sample: int
+        The period of the calls to callback
+    """
+
+    COUNTERS = ["generated", "expanded", "reexpanded", "stale", "max_open"]
+    TIMERS = ["time_heuristic", "time_expand", "time_queue", "time_total"]
+
+    def __init__(self, timing=False, callback=None, sample=1):
+        self.timing = timing
+        self.callback = callback
+        self.sample = sample
+        self.reset()
+
+    def reset(self):
+        """
+        Sets all the counters and timers to 0.
+        """
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        for name in self.TIMERS:
+            setattr(self, name, 0.)
+
+    def __repr__(self):
+        return f"<search_stats.SearchStats: expanded={self.expanded}, generated={self.generated}, time={self.time_total:.3g}s>"
+
+    def as_dict(self):
+        """
+        Returns the counters and timers as a dict (e.g. to write them as JSON), with the rate of expansions per second.
+        """
+        stats = {name: getattr(self, name) for name in self.COUNTERS + self.TIMERS}
+        stats["expanded_per_s"] = self.expanded/self.time_total if self.time_total > 0 else None
+        return stats
+
+class SearchResult():
+    """
+    A solution with the statistics of the search that found it.
+
+    Attributes:
+    -----------
+    swap_list: list[tuple[tuple[int]]] | None
+        The swaps of the solution, None if there is none
+    stats: SearchStats
+        The statistics of the search
+    """
+
+    def __init__(self, swap_list, stats):
+        self.swap_list = swap_list
+        self.stats = stats
+
+    def __repr__(self):
+        length = None if self.swap_list is None else len(self.swap_list)
+        return f"<search_stats.SearchResult: swaps={length}, expanded={self.stats.expanded}>"
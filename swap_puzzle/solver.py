@@ -1,13 +1,52 @@
 import math
+import os
+import time
 from grid import Grid
 from graph import Graph
 import heuristics
+from codec import get_codec
+from search_stats import SearchStats, SearchResult
 
 class Solver(): 
     """
     A solver class, to be implemented.
+
+    Attributes:
+    -----------
+    table_dir: str | None
+        Directory containing the precomputed distance tables (files table_{m}x{n}.npy, see distance_table.py). When a table
+        exists for the shape of a grid, get_solution reads an optimal solution from it instead of searching.
+    cache: SolutionCache | None
+        Cache of the exact results of the previous solves (see cache.py). The exact methods (bfs, A* and IDA* with an
+        admissible heuristic) store their solutions in it, A* and the bidirectional bfs use it to stop early.
+    nodes_expanded: int
+        The number of states expanded by the last search (0 for the methods that do not search)
     """
+    def __init__(self,table_dir=None,cache=None):
+        self.table_dir = table_dir
+        self.cache = cache
+        self.nodes_expanded = 0
+        self.tables = {} # Tables déjà chargées, par forme de grid (None si pas de table pour cette forme)
+
+    def get_table(self,m,n): # Renvoie la table des distances des grids m*n si elle a été précalculée, None sinon
+        if (m,n) not in self.tables:
+            self.tables[(m,n)] = None
+            if self.table_dir is not None:
+                from distance_table import DistanceTable, table_file # Import tardif : le module n'est chargé que si on a des tables
+                file_name = table_file(self.table_dir,m,n)
+                if os.path.exists(file_name):
+                    self.tables[(m,n)] = DistanceTable.load(file_name,m,n)
+        return self.tables[(m,n)]
+
+    def get_solution_table(self,grid): # Solution optimale lue dans la table, sans aucune recherche
+        self.nodes_expanded = 0
+        table = self.get_table(grid.m,grid.n)
+        if table is None:
+            return None
+        return table.get_solution(grid)
+
     def get_sol_naive(self,grid):
+        self.nodes_expanded = 0
         N = 1  # Chiffre que l'on cherche à bien ranger
         l = [] # Liste à laquelle on va ajouter les swaps au fur et à mesure 
         m, n = grid.m, grid.n
@@ -51,16 +90,357 @@ class Solver():
         
         
         """
-    def get_solution_not_opti(self,grid): # Aucun test de la fonction pour l'instant TODO 
+    def get_sol_constructive(self,grid): # Même principe que get_sol_naive (on range les tuiles 1, 2, ... une à une) en O(1) par swap
+        self.nodes_expanded = 0
+        m, n = grid.m, grid.n
+        l = grid.flatten()
+        pos = [0]*(m*n+1) # pos[v] est la case (indice aplati) de la tuile v, mis à jour à chaque swap
+        for c, v in enumerate(l):
+            pos[v] = c
+        cells = [(i,j) for i in range(m) for j in range(n)] # Coordonnées de chaque case, pour ne pas recréer les tuples
+        goal_row = [0] + [(v-1)//n for v in range(1,m*n+1)]
+        goal_col = [0] + [(v-1)%n for v in range(1,m*n+1)]
+        swap_list = []
+        append = swap_list.append
+        for t in range(m*n): # Les cases 0..t-1 sont rangées et ne sont plus jamais touchées
+            v = t+1
+            c = pos[v] # c >= t : la tuile est sur la ligne de sa case but ou en dessous
+            if c == t:
+                continue
+            tr, tc = divmod(t,n)
+            r, col = divmod(c,n)
+            while r > tr and col != tc: # Deux coups peuvent rapprocher la tuile : on choisit celui qui rapproche aussi l'autre tuile
+                side = 1 if col < tc else -1
+                if r-1 == tr and col < tc: # Monter ferait entrer dans une case déjà rangée
+                    d = c+side
+                elif goal_row[l[c-n]] >= r or (goal_col[l[c+side]]-col-side)*side >= 0: # L'autre tuile descend vers son but,
+                    d = c-n                                                               # ou le coup horizontal ne l'aide pas
+                else:
+                    d = c+side
+                w = l[d]
+                l[c] = w
+                pos[w] = c
+                append((cells[c],cells[d]))
+                c = d
+                r, col = divmod(c,n)
+            while c != t: # Il ne reste qu'une direction : vers le haut jusqu'à la ligne tr, ou vers la gauche sur cette ligne
+                d = c-n if c-t >= n else c-1
+                w = l[d]
+                l[c] = w
+                pos[w] = c
+                append((cells[c],cells[d]))
+                c = d
+            l[t] = v # La tuile v n'est écrite qu'une fois arrivée
+            pos[v] = t
+        grid.state = [l[i*n:(i+1)*n] for i in range(m)]
+        return swap_list
+
+        """ Complexité de la méthode constructive :
+
+        Grâce à l'index pos, trouver une tuile coûte O(1) et chaque swap coûte O(1). La tuile t est déplacée d'au plus m+n
+        cases, soit O(m*n*(m+n)) au total, et le nombre de swaps est la somme des distances de Manhattan des tuiles au moment
+        où on les range : le choix du coup améliore aussi la position de l'autre tuile déplacée quand c'est possible.
+        """
+
+    def get_solution_not_opti(self,grid,stats=None): # Aucun test de la fonction pour l'instant TODO 
         src, dst = grid.path_to_do() 
         state_graph = grid.graph_from_grid()
-        path = state_graph.bfs(src,dst)
+        path = state_graph.bfs(src,dst,stats)
         return path
 
-    def get_solution(self,grid,heuristic):
+    def get_solution(self,grid,heuristic,codec=None,stats=None): # stats : SearchStats optionnel rempli par le A*
+        return list(self.iter_solution(grid,heuristic,codec,stats))
+
+    def get_solution_stats(self,grid,heuristic,codec=None,timing=False,callback=None,sample=1):
+        """
+        Solves the grid as get_solution and returns a SearchResult: the swap list with the SearchStats of the A* (counters,
+        and timers if timing is True). callback(node, g, f, open_size) is called on every sample-th expansion.
+        """
+        stats = SearchStats(timing,callback,sample)
+        return SearchResult(self.get_solution(grid,heuristic,codec,stats),stats)
+
+    def iter_solution(self,grid,heuristic,codec=None,stats=None):
+        """
+        Generator version of get_solution: yields the swaps of an optimal solution one by one. The A* records the index of
+        the swap that leads to each state, so the swaps are read from the search without decoding any state.
+        """
         m,n = grid.m, grid.n
+        if self.get_table(m,n) is not None:
+            yield from self.get_solution_table(grid)
+            return
         g = Graph([])
-        src, dst = grid.path_to_do()
-        path = g.bfs_a_star(src,dst,m,n,heuristic)
-        swap_list = g.path_to_swap(path,m,n)
-        return swap_list
\ No newline at end of file
+        if codec is None:
+            codec = get_codec(m,n)
+        src, dst = grid.path_to_do(codec)
+        moves = g.bfs_a_star(src,dst,m,n,heuristic,codec,self.cache,moves=True,stats=stats)
+        self.nodes_expanded = g.nodes_expanded
+        if getattr(heuristic,"admissible",False): # Seules les solutions optimales vont dans le cache
+            self.store_solution(codec,src,moves)
+        yield from g.iter_swaps(moves,m,n,codec)
+
+    def get_solution_parallel(self,grid,heuristic,workers=None):
+        """
+        Optimal solution with the hash-distributed parallel A* of parallel_astar.py on workers processes (default: one
+        per core). The heuristic must be picklable and admissible (see hda_star).
+        """
+        from parallel_astar import hda_star # Import tardif : multiprocessing n'est chargé que pour ce mode
+        m,n = grid.m, grid.n
+        if self.get_table(m,n) is not None:
+            return self.get_solution_table(grid)
+        codec = get_codec(m,n,"packed")
+        src, dst = grid.path_to_do(codec)
+        moves, self.nodes_expanded = hda_star(src,dst,m,n,heuristic,workers)
+        if moves is None:
+            return None
+        if getattr(heuristic,"admissible",False):
+            self.store_solution(codec,src,moves)
+        return [codec.swaps[k] for k in moves]
+
+    def get_solution_beam(self,grid,width=100,alpha=2.,time_budget=None,max_depth=None,seed=0):
+        """
+        Beam search for the grids too large for an exact search: each layer keeps the width best states one swap further,
+        until the sorted grid is reached. A state is scored by the sum over its tiles of their Manhattan distance to their
+        goal cell, weighted by 1 + alpha*(m*n-v)/(m*n) for the tile v: placing the first tiles matters more, which keeps the
+        beam moving towards the goal instead of wandering on the plateaus of the plain Manhattan distance.
+
+        Each layer is handled as a whole with numpy: the score variations of all the swaps of all the states are computed at
+        once, only the best candidates are built, and they are deduplicated (within the layer and with the previous layers)
+        with a 64-bit hash of the states. Only the parent and the move of each state of each layer are kept, so the memory
+        is O(width*depth). If time_budget (seconds) or max_depth is reached, the best state of the last layer is finished
+        with get_sol_constructive. The grid is not modified.
+        """
+        import numpy as np # Import tardif : numpy n'est chargé que pour la recherche en faisceau
+        start = time.perf_counter()
+        self.nodes_expanded = 0
+        m, n = grid.m, grid.n
+        N = m*n
+        codec = get_codec(m,n)
+        a, b = np.array(codec.edges).T
+        d = np.array(heuristics.IncrementalHeuristic(m,n).cost, dtype=np.int64) # d[v][c] : distance de la case c au but de v
+        cost = np.round(16*d*(1 + alpha*(N - np.arange(N+1)[:,None])/N)).astype(np.int64).ravel() # cost[v*N+c]
+        keys = np.random.default_rng(seed).integers(0, 2**63, N, dtype=np.uint64) # h(l) = somme des l[c]*keys[c] modulo 2**64
+        dkeys = keys[a] - keys[b] # Le swap k ajoute (l[b]-l[a])*dkeys[k] au hash
+        states = np.array([grid.flatten()], dtype=np.int64)
+        here = cost[states*N + np.arange(N)] # here[i, c] : coût de la tuile de la case c de l'état i
+        scores = here.sum(axis=1) # Score nul si et seulement si la grid est triée
+        hashes = (states.astype(np.uint64) * keys).sum(axis=1)
+        seen = set(hashes.tolist())
+        parents, moves = [], [] # Pour chaque couche, le parent (indice dans la couche précédente) et le swap de chaque état
+        while not (scores == 0).any():
+            if (max_depth is not None and len(moves) >= max_depth) or \
+               (time_budget is not None and time.perf_counter() - start >= time_budget):
+                break
+            self.nodes_expanded += len(states)
+            x, y = states[:, a]*N, states[:, b]*N
+            xb, ya = cost[x + b], cost[y + a] # Coûts des deux tuiles après le swap
+            candidates = (scores[:, None] + xb + ya - here[:, a] - here[:, b]).ravel()
+            C = min(len(candidates), 4*width) # Les doublons et les états déjà vus sont écartés parmi ces candidats
+            best = np.argpartition(candidates, C-1)[:C]
+            best = best[np.argsort(candidates[best], kind="stable")]
+            p, k = np.divmod(best, len(a))
+            new_hashes = hashes[p] + ((y[p, k] - x[p, k])//N).astype(np.uint64)*dkeys[k] # Hash mis à jour sans construire l'état
+            keep = []
+            for i, h in enumerate(new_hashes.tolist()):
+                if h not in seen:
+                    seen.add(h)
+                    keep.append(i)
+                    if len(keep) == width:
+                        break
+            if not keep: # Tous les voisins ont déjà été vus : on termine avec la méthode constructive
+                break
+            p, k = p[keep], k[keep]
+            rows = np.arange(len(keep))
+            new, new_here = states[p], here[p] # Seuls les états retenus sont construits
+            new[rows, a[k]], new[rows, b[k]] = states[p, b[k]], states[p, a[k]]
+            new_here[rows, a[k]], new_here[rows, b[k]] = ya[p, k], xb[p, k]
+            states, here, scores, hashes = new, new_here, candidates[best][keep], new_hashes[keep]
+            parents.append(p)
+            moves.append(k)
+        done = np.flatnonzero(scores == 0)
+        i = int(done[0]) if len(done) else int(np.argmin(scores))
+        last = states[i].tolist()
+        path = []
+        for depth in range(len(moves)-1, -1, -1): # On remonte les couches depuis l'état retenu
+            path.append(codec.swaps[int(moves[depth][i])])
+            i = int(parents[depth][i])
+        path.reverse()
+        if not len(done):
+            path += self.get_sol_constructive(Grid(m, n, [last[r*n:(r+1)*n] for r in range(m)]))
+        return path
+
+    def get_solution_anytime(self,grid,heuristic,w=5.,w_step=1.,time_budget=None,node_budget=None,codec=None):
+        """
+        Anytime A* (see Graph.ara_star): returns the pair (swap_list, bound) of the best solution found within the budget
+        (time_budget in seconds, node_budget in expanded states, no limit if None) and of its proven suboptimality bound:
+        len(swap_list) is at most bound times the optimal number of swaps. Returns (None, math.inf) if no solution was
+        found within the budget.
+        """
+        m,n = grid.m, grid.n
+        if self.get_table(m,n) is not None:
+            return self.get_solution_table(grid), 1.
+        g = Graph([])
+        src, dst = grid.path_to_do(codec)
+        best, bound = None, math.inf
+        for moves, bound in g.ara_star(src,dst,m,n,heuristic,w,w_step,time_budget,node_budget,codec,moves=True):
+            best = moves
+            self.nodes_expanded = g.nodes_expanded
+        self.nodes_expanded = g.nodes_expanded
+        if best is None:
+            return None, math.inf
+        if codec is None:
+            codec = get_codec(m,n)
+        if bound == 1. and getattr(heuristic,"admissible",False): # Seules les solutions optimales vont dans le cache
+            self.store_solution(codec,src,best)
+        return list(g.iter_swaps(best,m,n,codec)), bound
+
+    def get_solution_bidir_stats(self,grid,codec=None,callback=None,sample=1):
+        """
+        Solves the grid as get_solution_bidir and returns a SearchResult: the swap list with the SearchStats of the
+        bidirectional BFS. callback(node, g, f, open_size) is called on every sample-th expansion (f is None).
+        """
+        stats = SearchStats(callback=callback,sample=sample)
+        return SearchResult(self.get_solution_bidir(grid,codec,stats),stats)
+
+    def get_solution_bidir(self,grid,codec=None,stats=None): # BFS bidirectionnel : on part à la fois de la grid et de la
+        start = time.perf_counter()                          # grid triée, stats est un SearchStats optionnel
+        m,n = grid.m, grid.n
+        if codec is None:
+            codec = get_codec(m,n,"packed") # Clés les moins chères à hasher, ce sont les seules opérations du parcours
+        src, dst = grid.path_to_do(codec)
+        self.nodes_expanded = 0
+        cached = self.get_cached(codec,src)
+        if cached is not None:
+            if stats is not None:
+                stats.time_total += time.perf_counter() - start
+            return [codec.swaps[k] for k in cached]
+        prev = [{src: None}, {dst: None}] # Pour chaque sens, sommet -> (parent, indice du swap)
+        depth = [{src: 0}, {dst: 0}]
+        frontier = [[src], [dst]]
+        level = [0, 0]
+        best_cached = None # (longueur, sommet, suite des swaps en cache) du meilleur chemin qui passe par le cache
+        moves = [] if src == dst else None
+        while moves is None and frontier[0] and frontier[1]:
+            side = 0 if len(frontier[0]) <= len(frontier[1]) else 1 # On étend toujours la frontière la plus petite
+            seen, other = prev[side], prev[1-side]
+            d_seen, d_other = depth[side], depth[1-side]
+            best, meet = None, None
+            next_frontier = []
+            if stats is not None:
+                stats.max_open = max(stats.max_open,len(frontier[0]) + len(frontier[1]))
+                stats.generated += len(frontier[side])*len(codec.edges) # Chaque état a un voisin par swap
+                if stats.callback is not None: # États de la frontière dont le rang d'expansion est un multiple de sample
+                    for v in frontier[side][stats.sample - self.nodes_expanded % stats.sample - 1::stats.sample]:
+                        stats.callback(v,d_seen[v],None,len(frontier[0]) + len(frontier[1]))
+            self.nodes_expanded += len(frontier[side])
+            for v in frontier[side]: # On traite un niveau complet pour garder le chemin le plus court parmi les rencontres
+                for ne, k in codec.neighbours(v):
+                    if ne not in seen:
+                        seen[ne] = (v,k)
+                        d_seen[ne] = d_seen[v] + 1
+                        next_frontier.append(ne)
+                        if ne in other and (best is None or d_seen[ne] + d_other[ne] < best):
+                            best, meet = d_seen[ne] + d_other[ne], ne
+                        if side == 0 and self.cache is not None: # Distance exacte déjà connue depuis ce sommet
+                            suffix = self.get_cached(codec,ne)
+                            if suffix is not None and (best_cached is None or d_seen[ne] + len(suffix) < best_cached[0]):
+                                best_cached = (d_seen[ne] + len(suffix), ne, suffix)
+            frontier[side] = next_frontier
+            level[side] += 1
+            if best_cached is not None and (best is None or best_cached[0] < best):
+                if meet is not None or best_cached[0] <= level[0] + level[1] + 1: # Aucun chemin plus court ne reste à trouver
+                    moves = self.bidir_moves(prev,best_cached[1]) + best_cached[2]
+            elif meet is not None:
+                moves = self.bidir_moves(prev,meet)
+        if stats is not None:
+            stats.expanded += self.nodes_expanded
+            stats.time_total += time.perf_counter() - start
+        if moves is None:
+            return None
+        self.store_solution(codec,src,moves)
+        return [codec.swaps[k] for k in moves]
+
+    def bidir_moves(self,prev,meet): # Indices des swaps du chemin passant par le sommet de rencontre meet
+        moves = []
+        cur_node = meet
+        while prev[0][cur_node] is not None: # Moitié côté grid initiale, remontée puis retournement
+            cur_node, k = prev[0][cur_node]
+            moves.append(k)
+        moves.reverse()
+        cur_node = meet
+        while prev[1].get(cur_node) is not None: # Moitié côté grid triée, déjà dans le bon sens
+            cur_node, k = prev[1][cur_node]
+            moves.append(k)
+        return moves
+
+    def get_cached(self,codec,key): # Solution optimale (indices des swaps) de l'état key si elle est dans le cache
+        if self.cache is None:
+            return None
+        packed = get_codec(codec.m,codec.n,"packed")
+        return self.cache.get_solution(packed,key if codec is packed else packed.encode(codec.decode(key)))
+
+    def store_solution(self,codec,key,moves): # Enregistre une solution optimale dans le cache
+        if self.cache is not None:
+            packed = get_codec(codec.m,codec.n,"packed")
+            self.cache.put_solution(packed,key if codec is packed else packed.encode(codec.decode(key)),moves)
+
+    def get_solution_ida(self,grid,heuristic,tt_size=0): # IDA* : mémoire linéaire en la profondeur de la solution
+        m,n = grid.m, grid.n
+        codec = get_codec(m,n)
+        dst = codec.goal()
+        goal = list(range(1,m*n+1))
+        edges = codec.edges
+        commute = [[not set(e1) & set(e2) for e2 in edges] for e1 in edges] # Swaps sur des cases disjointes
+        incremental = isinstance(heuristic,heuristics.IncrementalHeuristic)
+        l = grid.flatten() # Unique état, modifié sur place puis remis en état à chaque retour en arrière
+        path = []          # Indices des swaps du chemin courant
+        tt = {}            # Table de transposition bornée : état -> plus petite profondeur atteinte dans l'itération
+        FOUND = -1
+
+        def search(g,bound,comps,last):
+            self.nodes_expanded += 1
+            if incremental:
+                h = heuristic.value(comps)
+            else:
+                h = heuristic(codec.encode(l),dst,m,n)
+            f = g + h
+            if f > bound:
+                return f
+            if l == goal:
+                return FOUND
+            if tt_size:
+                key = codec.encode(l)
+                if key in tt and tt[key] <= g: # Déjà étendu avec un budget au moins aussi grand
+                    return math.inf
+                if key in tt or len(tt) < tt_size:
+                    tt[key] = g
+            minimum = math.inf
+            for k, (a,b) in enumerate(edges):
+                if k == last: # Refaire le dernier swap ramènerait à l'état parent
+                    continue
+                if last >= 0 and k < last and commute[last][k]: # Deux swaps qui commutent ne sont essayés que dans un ordre
+                    continue
+                new_comps = heuristic.update(l,comps,a,b) if incremental else None
+                l[a], l[b] = l[b], l[a]
+                path.append(k)
+                t = search(g+1,bound,new_comps,k)
+                if t == FOUND:
+                    return FOUND
+                path.pop()
+                l[a], l[b] = l[b], l[a]
+                if t < minimum:
+                    minimum = t
+            return minimum
+
+        self.nodes_expanded = 0
+        comps = heuristic.init(l) if incremental else None
+        bound = heuristic.value(comps) if incremental else heuristic(codec.encode(l),dst,m,n)
+        while True: # Chaque itération est une recherche en profondeur bornée par f = g + h <= bound
+            tt.clear()
+            t = search(0,bound,comps,-1)
+            if t == FOUND:
+                if getattr(heuristic,"admissible",False):
+                    self.store_solution(codec,codec.encode(grid.flatten()),path)
+                return [codec.swaps[k] for k in path]
+            if t == math.inf:
+                return None
+            bound = t
@@ -0,0 +1,103 @@
+"""
+This is the symmetry module. It maps the states of a grid to canonical representatives under the symmetries of the
+puzzle, so that caches and tables only store one state per class.
+
+A symmetry is a permutation s of the cells that preserves adjacency: the 180 degree rotation for every grid, and the
+transposition and the anti-transposition for square grids. The symmetry s maps the flattened state l to the state t
+with t[s[c]] = s[l[c]-1]+1: the tiles are moved and relabelled, so the sorted grid is mapped onto itself and the swap of
+the cells (a, b) in l becomes the swap of the cells (s[a], s[b]) in t. Both states are then at the same distance from the
+sorted grid, and a solution of one gives a solution of the other. All these symmetries are involutions (s[s[c]] = c), so
+the same permutation maps the solutions back.
+"""
+
+import operator
+from codec import get_codec
+
+def cell_symmetries(m, n):
+    """
+    Returns the list of the symmetries of the cells of an m*n grid (lists of the m*n images), the identity first.
+    """
+    N = m*n
+    perms = [list(range(N)), [N-1-c for c in range(N)]] # Identité et rotation de 180 degrés
+    if m == n:
+        perms.append([(c%n)*n + c//n for c in range(N)]) # Transposition
+        perms.append([N-1 - ((c%n)*n + c//n) for c in range(N)]) # Transposition par l'autre diagonale
+    return perms
+
+class Symmetries():
+    """
+    The symmetry group of the states of an m*n grid (of order 2, or 4 for square grids).
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    perms: list[list[int]]
+        perms[t] is the permutation of the cells of the symmetry t, perms[0] is the identity
+    edge_maps: list[list[int]]
+        edge_maps[t][k] is the index (in codec.edges) of the image of the move k by the symmetry t
+    """
+
+    def __init__(self, m, n):
+        self.m = m
+        self.n = n
+        self.perms = cell_symmetries(m, n)
+        edges = get_codec(m, n).edges
+        index = {e: k for k, e in enumerate(edges)}
+        self.edge_maps = [[index[tuple(sorted((s[a], s[b])))] for a, b in edges] for s in self.perms]
+        if 1 < m*n < 256: # Pour les clés en bytes : renumérotation des tuiles (bytes.translate) puis des cases
+            self.labels = [bytes([0] + [s[v-1]+1 for v in range(1, m*n+1)] + [0]*(255-m*n)) for s in self.perms]
+            self.getters = [operator.itemgetter(*s) for s in self.perms]
+
+    def __repr__(self):
+        return f"<symmetry.Symmetries: m={self.m}, n={self.n}, order={len(self.perms)}>"
+
+    def transform(self, l, t):
+        """
+        Returns the image of the flattened state l by the symmetry t.
+        """
+        s = self.perms[t]
+        image = [0]*len(l)
+        for c, v in enumerate(l):
+            image[s[c]] = s[v-1]+1
+        return image
+
+    def canonical(self, codec, key):
+        """
+        Returns the pair (canonical_key, t): the smallest key of the images of the state key (a key of codec) and the
+        symmetry t that maps the state onto it.
+        """
+        if isinstance(key, bytes) and self.m*self.n > 1: # Clé du codec "packed" : images calculées en C, sans décoder l'état
+            best, best_t = key, 0
+            for t in range(1, len(self.perms)):
+                image = bytes(self.getters[t](key.translate(self.labels[t])))
+                if image < best:
+                    best, best_t = image, t
+            return best, best_t
+        l = codec.decode(key)
+        best, best_t = key, 0
+        for t in range(1, len(self.perms)):
+            image = codec.encode(self.transform(l, t))
+            if image < best:
+                best, best_t = image, t
+        return best, best_t
+
+    def map_moves(self, moves, t):
+        """
+        Maps the list of the indices of the swaps of a solution through the symmetry t (in both directions, since the
+        symmetries are involutions).
+        """
+        edge_map = self.edge_maps[t]
+        return [edge_map[k] for k in moves]
+
+_symmetries = {}
+
+def get_symmetries(m, n):
+    """
+    Returns the symmetry group of the m*n grids (one object per shape, as get_codec).
+    """
+    if (m, n) not in _symmetries:
+        _symmetries[(m, n)] = Symmetries(m, n)
+    return _symmetries[(m, n)]
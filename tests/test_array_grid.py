@@ -0,0 +1,45 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import numpy as np
+from array_grid import ArrayGrid, legal_swaps, apply_batch, verify_batch
+from grid import Grid, IllegalMove
+
+class Test_ArrayGrid(unittest.TestCase):
+    def test_same_api(self): # Mêmes résultats que Grid sur les mêmes swaps
+        grid = ArrayGrid.grid_from_file("input/grid1.in")
+        self.assertEqual(grid.is_sorted(), False)
+        grid.swap((3,0), (3,1))
+        self.assertEqual(grid.is_sorted(), True)
+        self.assertEqual(grid.state[3][1], 8)
+        grid.state[0][0], grid.state[0][1] = 2, 1
+        self.assertEqual(grid.flatten()[:2], [2,1])
+        self.assertRaises(IllegalMove, grid.swap, (0,0), (1,1))
+
+    def test_swap_seq(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        array_grid = ArrayGrid.from_grid(grid)
+        swap_list = [((0,0),(0,1)), ((1,2),(2,2)), ((0,1),(1,1))]
+        grid.swap_seq(swap_list)
+        array_grid.swap_seq(swap_list)
+        self.assertEqual(array_grid.flatten(), grid.flatten())
+        with self.assertRaises(IllegalMove): # Les swaps avant le premier swap illégal sont faits
+            array_grid.swap_seq([((0,0),(0,1)), ((0,0),(2,2)), ((1,1),(1,2))])
+        grid.swap((0,0),(0,1))
+        self.assertEqual(array_grid.flatten(), grid.flatten())
+
+    def test_legal_swaps(self):
+        swap_list = [((0,0),(0,1)), ((0,0),(1,1)), ((3,0),(4,0)), ((2,1),(1,1)), ((0,0),(0,0))]
+        self.assertEqual(legal_swaps(swap_list,4,2).tolist(), [True, False, False, True, False])
+
+    def test_verify_batch(self): # Une même suite de swaps appliquée à plusieurs grids en une fois
+        states = np.array([[2,1,3,4,5,6],[1,2,3,4,5,6],[2,1,3,5,4,6]])
+        swap_list = [((0,0),(0,1))]
+        self.assertEqual(apply_batch(states,swap_list,2,3).tolist(), [[1,2,3,4,5,6],[2,1,3,4,5,6],[1,2,3,5,4,6]])
+        self.assertEqual(verify_batch(states,swap_list,2,3).tolist(), [True, False, False])
+        self.assertRaises(IllegalMove, verify_batch, states, [((0,0),(1,1))], 2, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import tempfile
+import signal
+from batch import solve_batch, solve_file, read_solution, time_limit, GridTimeout
+from grid import Grid
+from main import main
+
+class Test_Batch(unittest.TestCase):
+    def test_batch(self): # Chaque solution écrite trie bien la grid correspondante
+        with tempfile.TemporaryDirectory() as out_dir:
+            summaries = list(solve_batch("input/grid*.in",workers=2,out_dir=out_dir))
+            self.assertEqual(sorted(s["file"] for s in summaries), ["input/grid%d.in" % i for i in range(5)])
+            for s in summaries:
+                self.assertEqual(s["status"], "ok")
+                grid = Grid.grid_from_file(s["file"])
+                swap_list = read_solution(os.path.join(out_dir, os.path.basename(s["file"])[:-3] + ".out"))
+                grid.swap_seq(swap_list)
+                self.assertEqual((grid.is_sorted(), len(swap_list)), (True, s["swaps"]))
+
+    def test_timeout(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            summary = solve_file("input/grid4.in","a_star",timeout=0.01,out_dir=out_dir)
+            self.assertEqual(summary["status"], "timeout")
+            self.assertEqual(os.listdir(out_dir), [])
+
+    def test_time_limit(self): # Le bloc est interrompu, puis le gestionnaire précédent de SIGALRM est rétabli
+        handler = signal.getsignal(signal.SIGALRM)
+        with self.assertRaises(GridTimeout):
+            with time_limit(0.01):
+                while True:
+                    pass
+        self.assertEqual(signal.getsignal(signal.SIGALRM), handler)
+        with time_limit(None):
+            pass
+
+    def test_cache_stats(self): # Les statistiques du cache partagé figurent dans le résumé
+        with tempfile.TemporaryDirectory() as out_dir:
+            cache_file = os.path.join(out_dir, "cache.db")
+            first = solve_file("input/grid0.in","a_star",out_dir=out_dir,cache_file=cache_file)
+            second = solve_file("input/grid0.in","a_star",out_dir=out_dir,cache_file=cache_file)
+            self.assertEqual(first["cache"]["hits"], 0)
+            self.assertGreater(second["cache"]["hit_rate"], 0)
+            self.assertEqual(second["swaps"], first["swaps"])
+            self.assertGreater(second["cache"]["entries"], 0)
+
+    def test_error(self): # Le statut reste "error", le détail est dans un champ à part
+        with tempfile.TemporaryDirectory() as out_dir:
+            summary = solve_file(os.path.join(out_dir, "missing.in"),out_dir=out_dir)
+            self.assertEqual(summary["status"], "error")
+            self.assertIn("FileNotFoundError", summary["message"])
+
+    def test_no_match(self): # Aucun fichier ne correspond : erreur et code de retour non nul
+        self.assertNotEqual(main(["input/no_such_grid*.in"]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
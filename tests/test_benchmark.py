@@ -0,0 +1,54 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import json
+import copy
+import tempfile
+from benchmark import default_cases, run_benchmarks, compare, make_grid, main
+
+class Test_Benchmark(unittest.TestCase):
+    def test_seeded(self): # Les instances sont reproductibles
+        self.assertEqual(make_grid(3,3,2,5).state, make_grid(3,3,2,5).state)
+        names = [c["name"] for c in default_cases(quick=True)]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_run_compare(self):
+        cases = [c for c in default_cases(quick=True) if c["name"] in ("a_star-incremental/2x3/d3/s0", "bfs/1000-5000/s0")]
+        report = run_benchmarks(cases, repeat=1, timeout=10.)
+        self.assertEqual([r["status"] for r in report["results"]], ["ok", "ok"])
+        self.assertEqual(report["results"][0]["length"], 4)
+        for r in report["results"]:
+            self.assertGreater(r["peak_bytes"], 0)
+            self.assertGreater(r["nodes_per_s"], 0)
+        self.assertLess(report["results"][1]["nodes"], 1000) # Sommets réellement étendus, le bfs s'arrête à la destination
+        self.assertEqual(compare(report, report), [])
+        baseline = copy.deepcopy(report)
+        baseline["results"][0]["length"] = 3
+        baseline["results"][1]["time"] = report["results"][1]["time"]/10
+        self.assertEqual(sorted(r["metric"] for r in compare(baseline, report, min_time=0.)), ["length", "time"])
+
+    def test_import(self): # Le temps de démarrage fait partie des mesures
+        case = [c for c in default_cases(quick=True) if c["kind"] == "import"]
+        report = run_benchmarks(case, repeat=1)
+        self.assertEqual(report["results"][0]["status"], "ok")
+        self.assertGreater(report["results"][0]["time"], 0)
+        self.assertEqual(compare(report, report), [])
+
+    def test_main(self): # Code de sortie 1 quand un cas régresse par rapport à la référence
+        with tempfile.TemporaryDirectory() as out_dir:
+            out = os.path.join(out_dir, "bench.json")
+            args = ["--quick", "--repeat", "1", "--filter", "incremental/2x2", "--out", out]
+            self.assertEqual(main(args), 0)
+            with open(out) as file:
+                report = json.load(file)
+            for r in report["results"]:
+                r["length"] -= 1
+            with open(out, "w") as file:
+                json.dump(report, file)
+            self.assertEqual(main(args[:-1] + [out + ".new", "--compare", out]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
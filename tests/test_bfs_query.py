@@ -0,0 +1,36 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import tempfile
+from graph import Graph, CSRGraph, BFSQueryEngine
+
+class Test_BFSQueryEngine(unittest.TestCase):
+    def test_query_file(self): # Le fichier produit est identique aux fichiers .path.out donnés
+        with tempfile.TemporaryDirectory() as out_dir:
+            for name in ["input/graph1", "input/graph2"]:
+                for graph in (Graph.graph_from_file(name + ".in"), CSRGraph.from_file(name + ".in")):
+                    engine = BFSQueryEngine(graph)
+                    out_file = os.path.join(out_dir, "out.path.out")
+                    engine.query_file(name + ".path.out", out_file)
+                    with open(out_file) as f1, open(name + ".path.out") as f2:
+                        self.assertEqual(f1.read(), f2.read())
+                    self.assertEqual(engine.misses, 19) # Un seul bfs par source
+
+    def test_lru(self): # Au-delà de max_bytes, les arbres les plus anciens sont supprimés
+        g = Graph([1,2,3,4,5,6,7])
+        for node1, node2 in [(1,2),(1,3),(1,4),(2,4),(3,5),(3,7),(6,7)]:
+            g.add_edge(node1,node2)
+        engine = BFSQueryEngine(g, max_bytes=64)
+        self.assertEqual(engine.path(1,6), [1,3,7,6])
+        self.assertEqual(engine.path(6,1), [6,7,3,1])
+        self.assertEqual(engine.path(1,4), [1,4])
+        self.assertEqual(list(engine.trees), [6, 1])
+        engine.path(2,5)
+        self.assertEqual((list(engine.trees), engine.nbytes), ([1, 2], 64))
+        self.assertEqual((engine.hits, engine.misses), (1, 3))
+
+if __name__ == '__main__':
+    unittest.main()
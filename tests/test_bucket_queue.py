@@ -0,0 +1,31 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import random
+from graph import Graph, BucketQueue
+from distance_table import DistanceTable
+from heuristics import IncrementalHeuristic
+from codec import get_codec
+
+class Test_BucketQueue(unittest.TestCase):
+    def test_order(self): # Plus petit f d'abord, à égalité le plus grand g
+        q = BucketQueue()
+        for f, g, v in [(5,1,"a"),(3,0,"b"),(5,4,"c"),(3,2,"d"),(-1,0,"e")]:
+            q.push(f,g,v)
+        self.assertEqual([q.pop() for _ in range(len(q))], [(-1,0,"e"),(3,2,"d"),(3,0,"b"),(5,4,"c"),(5,1,"a")])
+        self.assertEqual((len(q), q.buckets, q.keys), (0, {}, []))
+
+    def test_a_star_optimal(self): # Le A* avec la liste fermée donne les distances exactes des grids 2*4
+        table = DistanceTable.build(2,4)
+        codec = get_codec(2,4)
+        dst = codec.encode(list(range(1,9)))
+        random.seed(4)
+        for r in random.sample(range(table.codec.nb_states), 30):
+            src = codec.encode(table.codec.decode(r))
+            path = Graph([]).bfs_a_star(src,dst,2,4,IncrementalHeuristic(2,4))
+            self.assertEqual(len(path)-1, table.dist[r])
+
+if __name__ == '__main__':
+    unittest.main()
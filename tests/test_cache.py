@@ -0,0 +1,89 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import tempfile
+import multiprocessing
+from cache import SolutionCache
+from codec import get_codec
+from grid import Grid
+from solver import Solver
+import heuristics
+
+def put_in_other_process(file_name, results): # Écrit une solution dans le cache depuis un autre processus
+    cache = SolutionCache(file_name)
+    codec = get_codec(2,2,"packed")
+    try:
+        cache.put_solution(codec,codec.encode([2,1,3,4]),[codec.swap_index[((0,0),(0,1))]])
+        cache.close()
+        results.put("ok")
+    except Exception as e:
+        results.put(repr(e))
+
+class Test_SolutionCache(unittest.TestCase):
+    def test_put_get(self):
+        cache = SolutionCache()
+        codec = get_codec(2,2,"packed")
+        grid = Grid.grid_from_file("input/grid0.in")
+        moves = [codec.swap_index[s] for s in Solver().get_solution_bidir(grid)]
+        cache.put_solution(codec,codec.encode(grid.flatten()),moves)
+        self.assertEqual(cache.get_solution(codec,codec.encode(grid.flatten())), moves)
+        self.assertEqual(cache.get(codec,codec.goal()), (0,-1))
+        self.assertEqual(cache.get(get_codec(1,4,"packed"),codec.goal()), None) # La forme fait partie de la clé
+        self.assertEqual(len(cache), len(moves)+1)
+
+    def test_eviction(self):
+        cache = SolutionCache(max_entries=3)
+        codec = get_codec(2,2,"packed")
+        cache.put_solution(codec,codec.encode([4,3,2,1]),[0,3,1,2])
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.get(codec,codec.goal()), (0,-1)) # Les états les plus anciens sont supprimés
+
+    def test_solver_cache(self): # Le second solve de la même grid s'arrête dès le sommet initial
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SolutionCache(os.path.join(cache_dir,"cache.db"))
+            s = Solver(cache=cache)
+            grid = Grid.grid_from_file("input/grid4.in")
+            h = heuristics.IncrementalHeuristic(4,4)
+            swap_list = s.get_solution(grid,h)
+            self.assertEqual(s.get_solution(grid,h), swap_list)
+            self.assertEqual(s.nodes_expanded, 0)
+            self.assertEqual(len(s.get_solution_bidir(grid)), 14) # Trouvée directement dans le cache
+            cache.close()
+            cache = SolutionCache(os.path.join(cache_dir,"cache.db")) # Le cache persiste sur le disque
+            self.assertEqual(len(Solver(cache=cache).get_solution(grid,h)), 14)
+            self.assertGreater(cache.stats()["hit_rate"], 0)
+            cache.close()
+
+    def test_shared_between_processes(self): # Une lecture en cours ne bloque pas les écritures des autres processus
+        with tempfile.TemporaryDirectory() as cache_dir:
+            file_name = os.path.join(cache_dir,"cache.db")
+            cache = SolutionCache(file_name)
+            codec = get_codec(2,2,"packed")
+            cache.put_solution(codec,codec.encode([1,2,4,3]),[codec.swap_index[((1,0),(1,1))]])
+            self.assertEqual(cache.get(codec,codec.goal()), (0,-1)) # Un succès, la recherche continue
+            results = multiprocessing.Queue()
+            p = multiprocessing.Process(target=put_in_other_process, args=(file_name,results))
+            p.start()
+            p.join()
+            self.assertEqual(results.get(timeout=10), "ok")
+            self.assertEqual(cache.get(codec,codec.encode([2,1,3,4])), (1,codec.swap_index[((0,0),(0,1))]))
+            cache.close()
+
+    def test_bidir_near_grid(self): # Une grid voisine d'une grid déjà résolue profite du cache
+        cache = SolutionCache()
+        s = Solver(cache=cache)
+        grid = Grid(3,3,[[9,8,7],[6,5,4],[3,2,1]])
+        s.get_solution_bidir(grid)
+        hits = cache.hits
+        grid.swap((0,0),(0,1))
+        swap_list = s.get_solution_bidir(grid)
+        self.assertGreater(cache.hits, hits)
+        self.assertEqual(len(swap_list), len(Solver().get_solution_bidir(grid)))
+        grid.swap_seq(swap_list)
+        self.assertEqual(grid.is_sorted(), True)
+
+if __name__ == '__main__':
+    unittest.main()
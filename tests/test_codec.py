@@ -0,0 +1,69 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import itertools
+import random
+from codec import get_codec
+from grid import Grid
+from solver import Solver
+import heuristics
+
+class Test_Codec(unittest.TestCase):
+    def test_base_is_historical_id(self): # Le codec par défaut donne les mêmes identifiants que l'ancien Grid.id
+        grid = Grid.grid_from_file("input/grid2.in")
+        l = grid.flatten()
+        self.assertEqual(grid.id(l), sum(l[i]*10**i for i in range(9)))
+
+    def test_round_trip(self):
+        for kind in ["base", "rank", "packed"]:
+            for m, n in [(2,2), (3,3), (4,4), (10,10)]:
+                codec = get_codec(m,n,kind)
+                l = list(range(1,m*n+1))
+                random.shuffle(l)
+                self.assertEqual(codec.decode(codec.encode(l)), l)
+                self.assertEqual(codec.decode(codec.goal()), list(range(1,m*n+1)))
+
+    def test_rank_is_dense(self):
+        codec = get_codec(2,3,"rank")
+        ranks = sorted(codec.encode(list(p)) for p in itertools.permutations(range(1,7)))
+        self.assertEqual(ranks, list(range(720)))
+
+    def test_id_to_grid_4x4(self): # Le décodage par flottants corrompait les grids 4x4
+        grid = Grid.grid_from_file("input/grid4.in")
+        src, dst = grid.path_to_do()
+        self.assertEqual(Grid(1,1).id_to_grid(src,4,4).state, grid.state)
+
+    def test_findswap(self):
+        for kind in ["base", "rank", "packed"]:
+            codec = get_codec(2,3,kind)
+            g = Grid(2,3)
+            p = codec.encode(g.flatten())
+            g.swap((0,2),(1,2))
+            q = codec.encode(g.flatten())
+            self.assertEqual(g.findswap(p,q,2,3,codec), ((0,2),(1,2)))
+
+    def test_neighbours(self): # Chaque swap adjacent donne exactement un voisin, identique pour tous les codecs
+        grid = Grid.grid_from_file("input/grid2.in")
+        expected = []
+        for swap in get_codec(3,3).swaps:
+            g = grid.copy()
+            g.swap(*swap)
+            expected.append(g.flatten())
+        self.assertEqual(len(expected), 12)
+        for kind in ["base", "rank", "packed"]:
+            codec = get_codec(3,3,kind)
+            neighbours = codec.neighbours(codec.encode(grid.flatten()))
+            self.assertEqual([codec.decode(v) for v, k in neighbours], expected)
+            self.assertEqual([k for v, k in neighbours], list(range(12)))
+
+    def test_a_star_codecs(self):
+        for kind in ["rank", "packed"]:
+            grid = Grid.grid_from_file("input/grid2.in")
+            swap_list = Solver().get_solution(grid,heuristics.manhattan_distance,get_codec(3,3,kind))
+            grid.swap_seq(swap_list)
+            self.assertEqual(grid.state,[[1,2,3],[4,5,6],[7,8,9]])
+
+if __name__ == '__main__':
+    unittest.main()
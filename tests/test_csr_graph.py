@@ -0,0 +1,40 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+from graph import Graph, CSRGraph
+
+class Test_CSRGraph(unittest.TestCase):
+    def test_from_graph(self): # Mêmes listes d'adjacence et même plus court chemin que le graph de test_path
+        g = Graph([1,2,3,4,5,6,7])
+        for node1, node2 in [(1,2),(1,3),(1,4),(2,4),(3,5),(3,7),(6,7)]:
+            g.add_edge(node1,node2)
+        csr = CSRGraph.from_graph(g)
+        self.assertEqual((csr.nb_nodes, csr.nb_edges), (7, 7))
+        for v in g.nodes:
+            self.assertEqual(csr.neighbours(v).tolist(), g.graph[v])
+        self.assertEqual(csr.bfs(1,6), [1,3,7,6])
+        self.assertEqual(csr.bfs(5,5), [5])
+
+    def test_same_node(self): # Même convention pour les deux classes : un chemin sans arête
+        g = Graph([1,2,3])
+        g.add_edge(1,2)
+        for graph in (g, CSRGraph.from_graph(g)):
+            self.assertEqual(graph.bfs(2,2), [2])
+            self.assertEqual(graph.bfs(3,3), [3]) # Sommet isolé
+
+    def test_path_files(self): # Les longueurs des plus courts chemins sont celles des fichiers .path.out
+        for name in ["input/graph1", "input/graph2"]:
+            csr = CSRGraph.from_file(name + ".in")
+            with open(name + ".path.out", "r") as file:
+                for line in file:
+                    src, dst, length = line.split()[:3]
+                    path = csr.bfs(int(src),int(dst))
+                    self.assertEqual(None if path is None else len(path)-1, None if length == "None" else int(length))
+
+    def test_format(self):
+        self.assertRaises(ValueError, CSRGraph.from_edges, 3, [(1,4)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import tempfile
+from distance_table import DistanceTable, table_file
+from grid import Grid
+from solver import Solver
+
+class Test_DistanceTable(unittest.TestCase):
+    def test_build(self):
+        table = DistanceTable.build(2,3)
+        self.assertEqual(len(table.dist), 720)
+        self.assertEqual(table.distance(Grid(2,3)), 0)
+        self.assertEqual(table.distance(Grid(2,3,[[4,5,6],[1,2,3]])), 3)
+
+    def test_optimal(self): # Les solutions lues dans la table ont la longueur du bfs bidirectionnel
+        table = DistanceTable.build(2,4)
+        s = Solver()
+        for _ in range(5):
+            grid = Grid(2,4)
+            grid.generate_grid(3)
+            swap_list = table.get_solution(grid.copy())
+            self.assertEqual(len(swap_list), len(s.get_solution_bidir(grid.copy())))
+            grid.swap_seq(swap_list)
+            self.assertEqual(grid.is_sorted(), True)
+
+    def test_corrupted(self): # Une table fausse lève une erreur au lieu de boucler indéfiniment
+        table = DistanceTable.build(2,2)
+        dist = table.dist.copy()
+        dist[dist == 1] = 3
+        with self.assertRaises(ValueError):
+            DistanceTable(2,2,dist).get_solution(Grid(2,2,[[2,1],[3,4]]))
+
+    def test_solver_table(self): # Le Solver détecte la table sauvegardée pour la forme de la grid
+        with tempfile.TemporaryDirectory() as table_dir:
+            DistanceTable.build(4,2).save(table_file(table_dir,4,2))
+            s = Solver(table_dir)
+            grid = Grid.grid_from_file("input/grid1.in")
+            self.assertEqual(s.get_solution(grid,None), [((3,0),(3,1))])
+            self.assertEqual(s.get_table(3,3), None)
+            del s # Libère le fichier mappé en mémoire avant la suppression du dossier
+
+if __name__ == '__main__':
+    unittest.main()
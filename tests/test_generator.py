@@ -0,0 +1,53 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import tempfile
+from generator import generate, write_grid_files, write_corpus_binary, main
+from loaders import read_corpus_binary
+from distance_table import DistanceTable
+from codec import get_codec
+from grid import Grid
+from graph import Graph
+from heuristics import IncrementalHeuristic
+
+class Test_Generator(unittest.TestCase):
+    def test_table(self): # Petites grids : tirage dans la table des distances
+        table = DistanceTable.build(2,3)
+        instances = list(generate(2,3,4,6,count=200,seed=3))
+        self.assertEqual(len(instances), 200)
+        for l, d in instances:
+            self.assertEqual((4 <= d <= 6, int(table.dist[table.codec.encode(l)])), (True, d))
+        self.assertEqual(instances, list(generate(2,3,4,6,count=200,seed=3))) # Reproductible
+        self.assertNotEqual(instances, list(generate(2,3,4,6,count=200,seed=4)))
+
+    def test_walk(self): # Grids plus grandes : marches aléatoires vérifiées par le A*
+        codec = get_codec(3,3)
+        instances = list(generate(3,3,9,count=10,seed=0))
+        self.assertEqual(instances, list(generate(3,3,9,count=10,seed=0)))
+        for l, d in instances:
+            path = Graph([]).bfs_a_star(codec.encode(l),codec.goal(),3,3,IncrementalHeuristic(3,3),moves=True)
+            self.assertEqual((d, len(path)), (9, 9))
+        self.assertRaises(ValueError, lambda: list(generate(2,2,7,count=1))) # Aucune grid 2*2 à distance 7
+
+    def test_output(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            self.assertEqual(write_grid_files(generate(2,2,2,count=5,seed=1),out_dir,2,2), 5)
+            with open(os.path.join(out_dir,"distances.txt")) as index:
+                lines = [line.split() for line in index]
+            self.assertEqual([d for _, d in lines], ["2"]*5)
+            grid = Grid.grid_from_file(os.path.join(out_dir,lines[0][0]))
+            self.assertEqual(sorted(grid.flatten()), [1,2,3,4])
+            file_name = os.path.join(out_dir,"corpus.bin")
+            self.assertEqual(write_corpus_binary(generate(2,3,5,count=10,seed=1),file_name,2,3,chunk=4), 10)
+            m, n, records = read_corpus_binary(file_name)
+            self.assertEqual((m, n, records.shape), (2, 3, (10, 7)))
+            self.assertEqual([r[:-1] for r in records.tolist()], [l for l, d in generate(2,3,5,count=10,seed=1)])
+            del records
+            self.assertEqual(main(["2","2","--distance","1","--count","3","--binary",file_name]), 0)
+            self.assertEqual(read_corpus_binary(file_name)[2][:,-1].tolist(), [1,1,1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import random
+from heuristics import IncrementalHeuristic, inversions
+from distance_table import DistanceTable
+from codec import get_codec
+from grid import Grid
+from graph import Graph
+
+class Test_IncrementalHeuristic(unittest.TestCase):
+    def test_inversions(self):
+        self.assertEqual(inversions([3,1,2]), 2)
+        self.assertEqual(inversions(list(range(1,10))), 0)
+
+    def test_admissible(self): # Comparaison avec les distances exactes de toutes les grids 2*4
+        table = DistanceTable.build(2,4)
+        h = IncrementalHeuristic(2,4)
+        for r in range(table.codec.nb_states):
+            self.assertLessEqual(h.value(h.init(table.codec.decode(r))), table.dist[r])
+
+    def test_update(self): # Les mises à jour swap par swap donnent les mêmes composantes que le calcul complet
+        h = IncrementalHeuristic(3,4)
+        codec = get_codec(3,4)
+        l = list(range(1,13))
+        comps = h.init(l)
+        for _ in range(100):
+            a, b = random.choice(codec.edges)
+            comps = h.update(l,comps,a,b)
+            l[a], l[b] = l[b], l[a]
+            self.assertEqual(comps, h.init(l))
+
+    def test_g4_a_star(self):
+        g = Graph([])
+        grid = Grid.grid_from_file("input/grid4.in")
+        src, dst = grid.path_to_do()
+        path = g.bfs_a_star(src,dst,4,4,IncrementalHeuristic(4,4))
+        swap_list = g.path_to_swap(path,4,4)
+        grid.swap_seq(swap_list)
+        self.assertEqual((grid.is_sorted(), len(swap_list)), (True, 14))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+from implicit_bfs import ImplicitBFS
+from codec import get_codec
+from grid import Grid
+
+class Test_ImplicitBFS(unittest.TestCase):
+    def test_memory(self): # Un bit par état pour visited, un octet par état pour les parents
+        bfs = ImplicitBFS(3,3)
+        self.assertEqual(len(bfs.visited), 45360)
+        self.assertEqual(len(bfs.moves), 362880)
+
+    def test_full_component(self): # Tous les états 2*3 sont atteignables depuis la grid triée
+        bfs = ImplicitBFS(2,3)
+        self.assertEqual(bfs.run(bfs.codec.goal()), True)
+        self.assertEqual(all(bfs.is_visited(r) for r in range(720)), True)
+
+    def test_g2_swaps(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        rank = get_codec(3,3,"rank")
+        src, dst = grid.path_to_do(rank)
+        bfs = ImplicitBFS(3,3)
+        self.assertEqual(bfs.run(src,dst), True)
+        path = bfs.get_path(dst)
+        self.assertEqual((path[0], path[-1], len(path)), (src, dst, 5))
+        grid.swap_seq(bfs.get_swaps(dst))
+        self.assertEqual(grid.state, [[1,2,3],[4,5,6],[7,8,9]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import tempfile
+import numpy as np
+from loaders import read_grid_text, read_graph, grid_to_binary, grid_to_text, graph_to_binary, graph_to_text
+from grid import Grid
+from graph import Graph
+
+class Test_Loaders(unittest.TestCase):
+    def test_grid_binary(self): # Aller-retour texte -> binaire -> texte
+        with tempfile.TemporaryDirectory() as tmp:
+            grid_to_binary("input/grid3.in", os.path.join(tmp, "grid3.bin"))
+            grid = Grid.grid_from_file(os.path.join(tmp, "grid3.bin"))
+            self.assertEqual(grid.state, Grid.grid_from_file("input/grid3.in").state)
+            grid_to_text(os.path.join(tmp, "grid3.bin"), os.path.join(tmp, "grid3.in"))
+            with open(os.path.join(tmp, "grid3.in")) as f1, open("input/grid3.in") as f2:
+                self.assertEqual(f1.read().split(), f2.read().split())
+
+    def test_graph_binary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            graph_to_binary("input/graph1.in", os.path.join(tmp, "graph1.bin"))
+            n, edges = read_graph(os.path.join(tmp, "graph1.bin"))
+            self.assertIsInstance(edges.base, np.memmap) # Pas de copie du tableau des arêtes
+            g1, g2 = Graph.graph_from_file(os.path.join(tmp, "graph1.bin")), Graph.graph_from_file("input/graph1.in")
+            self.assertEqual((g1.graph, g1.edges, g1.nb_edges), (g2.graph, g2.edges, 100))
+            graph_to_text(os.path.join(tmp, "graph1.bin"), os.path.join(tmp, "graph1.in"))
+            with open(os.path.join(tmp, "graph1.in")) as f1, open("input/graph1.in") as f2:
+                self.assertEqual(f1.read(), f2.read())
+            del edges, n
+
+    def test_format(self): # Mêmes erreurs que la lecture ligne par ligne
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, text in [("short.in", "2 2\n1 2\n3\n"), ("missing.in", "2 2\n1 2\n"), ("long.in", "1 2\n1 2 3\n")]:
+                with open(os.path.join(tmp, name), "w") as file:
+                    file.write(text)
+                self.assertRaises(Exception, Grid.grid_from_file, os.path.join(tmp, name))
+            with open(os.path.join(tmp, "graph.in"), "w") as file:
+                file.write("3 2\n1 2\n2\n")
+            self.assertRaises(Exception, Graph.graph_from_file, os.path.join(tmp, "graph.in"))
+            with open(os.path.join(tmp, "extra.in"), "w") as file: # Les lignes en trop sont ignorées
+                file.write("1 2\n2 1\n5 6 7\n")
+            self.assertEqual(read_grid_text(os.path.join(tmp, "extra.in"))[2].tolist(), [2, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import random
+from types import SimpleNamespace
+from unittest import mock
+import parallel_astar
+from parallel_astar import hda_star, owner
+from codec import get_codec
+from grid import Grid
+from graph import Graph
+from solver import Solver
+import heuristics
+
+class Test_HDAStar(unittest.TestCase):
+    def test_owner(self): # Tous les processus possèdent des sommets
+        codec = get_codec(3,3,"packed")
+        random.seed(0)
+        owners = {owner(codec.encode(random.sample(range(1,10),9)),4) for _ in range(100)}
+        self.assertEqual(owners, {0,1,2,3})
+
+    def test_optimal(self): # Mêmes longueurs que le A* séquentiel
+        codec = get_codec(3,3,"packed")
+        h = heuristics.IncrementalHeuristic(3,3)
+        random.seed(5)
+        for workers in (1,3):
+            l = random.sample(range(1,10),9)
+            moves, expanded = hda_star(codec.encode(l),codec.goal(),3,3,h,workers)
+            ref = Graph([]).bfs_a_star(codec.encode(l),codec.goal(),3,3,h,codec,moves=True)
+            self.assertEqual(len(moves), len(ref))
+            self.assertGreater(expanded, 0)
+            for k in moves:
+                a, b = codec.edges[k]
+                l[a], l[b] = l[b], l[a]
+            self.assertEqual(l, list(range(1,10)))
+        self.assertEqual(hda_star(codec.goal(),codec.goal(),3,3,h,2), ([], 0))
+
+    def test_solver(self):
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid2.in")
+        swap_list = s.get_solution_parallel(grid,heuristics.IncrementalHeuristic(3,3),workers=2)
+        grid.swap_seq(swap_list)
+        self.assertEqual((grid.is_sorted(), len(swap_list)), (True, 4))
+
+    def test_dead_worker(self): # Pendant la reconstruction du chemin, un processus terminé ne répondra plus
+        alive, done, failed = SimpleNamespace(exitcode=None), SimpleNamespace(exitcode=0), SimpleNamespace(exitcode=1)
+        parallel_astar._check([alive, done])
+        self.assertRaises(RuntimeError, parallel_astar._check, [alive, failed])
+        self.assertRaises(RuntimeError, parallel_astar._check, [alive, done], stopped=True)
+
+    def test_solver_unsolved(self): # Pas de chemin : None, comme les autres méthodes du solver
+        grid = Grid.grid_from_file("input/grid2.in")
+        with mock.patch.object(parallel_astar, "hda_star", return_value=(None, 10)):
+            self.assertEqual(Solver().get_solution_parallel(grid,heuristics.IncrementalHeuristic(3,3),workers=2), None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import tempfile
+from pattern_database import PatternDatabase
+from distance_table import DistanceTable
+from grid import Grid
+from graph import Graph
+
+class Test_PatternDatabase(unittest.TestCase):
+    def test_admissible(self): # Comparaison avec les distances exactes sur toutes les grids 2*4
+        table = DistanceTable.build(2,4)
+        pdb = PatternDatabase(2,4)
+        for r in range(table.codec.nb_states):
+            self.assertLessEqual(pdb.value(table.codec.decode(r)), table.dist[r])
+
+    def test_save_load(self):
+        pdb = PatternDatabase(3,3,[[1,2,3,4],[5,6,7,8,9]])
+        grid = Grid.grid_from_file("input/grid2.in")
+        with tempfile.TemporaryDirectory() as table_dir:
+            pdb.save(table_dir)
+            pdb2 = PatternDatabase.load(table_dir,3,3,[[1,2,3,4],[5,6,7,8,9]])
+            self.assertEqual(pdb2.value(grid.flatten()), pdb.value(grid.flatten()))
+            del pdb2
+
+    def test_g4_a_star(self): # La grid 4*4 que manhattan_distance ne résout pas en temps raisonnable
+        g = Graph([])
+        grid = Grid.grid_from_file("input/grid4.in")
+        src, dst = grid.path_to_do()
+        path = g.bfs_a_star(src,dst,4,4,PatternDatabase(4,4))
+        swap_list = g.path_to_swap(path,4,4)
+        grid.swap_seq(swap_list)
+        self.assertEqual((grid.is_sorted(), len(swap_list)), (True, 14))
+
+if __name__ == '__main__':
+    unittest.main()
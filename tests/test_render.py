@@ -0,0 +1,40 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import os
+import subprocess
+import tempfile
+from grid import Grid
+from solver import Solver
+from render import render_solution, render_files, solution_states
+from batch import write_solution
+
+class Test_Render(unittest.TestCase):
+    def test_import(self): # Résoudre une grid ne charge ni matplotlib ni numpy
+        code = "import sys; sys.path.append('swap_puzzle/'); import grid, solver, batch; " \
+               "print('matplotlib' in sys.modules, 'numpy' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), "False False")
+
+    def test_render(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        swap_list = Solver().get_solution_bidir(grid)
+        states = solution_states(grid, swap_list)
+        self.assertEqual((len(states), states[0], states[-1]), (5, grid.state, [[1,2,3],[4,5,6],[7,8,9]]))
+        with tempfile.TemporaryDirectory() as out_dir:
+            self.assertEqual(len(render_solution(grid, swap_list, out_dir, "grid2", "frames")), 5)
+            for mode, ext in [("sheet", ".png"), ("gif", ".gif")]:
+                files = render_solution(grid, swap_list, out_dir, "grid2", mode)
+                self.assertEqual(files, [os.path.join(out_dir, "grid2" + ext)])
+                self.assertGreater(os.path.getsize(files[0]), 0)
+
+    def test_render_files(self): # Seules les grids qui ont un fichier .out sont dessinées
+        with tempfile.TemporaryDirectory() as out_dir:
+            write_solution(os.path.join(out_dir, "grid1.out"), [((3,0),(3,1))])
+            files = render_files(["input/grid0.in", "input/grid1.in"], out_dir, out_dir)
+            self.assertEqual(files, [os.path.join(out_dir, "grid1.png")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+from search_stats import SearchStats
+from graph import Graph, CSRGraph
+from grid import Grid
+from solver import Solver
+from implicit_bfs import ImplicitBFS
+import heuristics
+
+class Test_SearchStats(unittest.TestCase):
+    def test_a_star(self):
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid4.in")
+        traced = []
+        result = s.get_solution_stats(grid,heuristics.IncrementalHeuristic(4,4),timing=True,
+                                      callback=lambda *args: traced.append(args),sample=10)
+        stats = result.stats
+        self.assertEqual(len(result.swap_list), 14)
+        self.assertEqual(stats.expanded, s.nodes_expanded)
+        self.assertEqual(len(traced), stats.expanded//10)
+        self.assertEqual(stats.reexpanded, 0) # Heuristique consistante
+        self.assertGreaterEqual(stats.generated, stats.expanded)
+        self.assertGreater(stats.max_open, 1)
+        self.assertGreater(stats.time_heuristic, 0)
+        self.assertGreaterEqual(stats.time_total, stats.time_heuristic + stats.time_expand + stats.time_queue)
+        self.assertEqual(set(stats.as_dict()), set(SearchStats.COUNTERS + SearchStats.TIMERS + ["expanded_per_s"]))
+        self.assertEqual(s.get_solution(grid,heuristics.IncrementalHeuristic(4,4)), result.swap_list) # Sans stats
+
+    def test_bfs(self): # Mêmes compteurs pour le bfs de Graph et celui de CSRGraph sur l'arbre complet
+        g = Graph([1,2,3,4,5,6,7])
+        for node1, node2 in [(1,2),(1,3),(1,4),(2,4),(3,5),(3,7),(6,7)]:
+            g.add_edge(node1,node2)
+        stats, csr_stats = SearchStats(), SearchStats()
+        self.assertEqual(g.bfs_aux(1,stats=stats), g.bfs_aux(1))
+        CSRGraph.from_graph(g).bfs_aux(1,stats=csr_stats)
+        self.assertEqual((stats.expanded, stats.generated), (7, 14))
+        self.assertEqual((csr_stats.expanded, csr_stats.generated), (7, 14))
+        self.assertEqual((stats.max_open, csr_stats.max_open), (3, 3))
+
+    def test_bfs_path(self): # stats passe par bfs, et le callback de CSRGraph respecte sample comme celui de Graph
+        g = Graph([1,2,3,4,5,6,7])
+        for node1, node2 in [(1,2),(1,3),(1,4),(2,4),(3,5),(3,7),(6,7)]:
+            g.add_edge(node1,node2)
+        traced, csr_traced = [], []
+        stats = SearchStats(callback=lambda *args: traced.append(args[0]),sample=2)
+        csr_stats = SearchStats(callback=lambda *args: csr_traced.append(args[0]),sample=2)
+        self.assertEqual(g.bfs(1,6,stats), [1,3,7,6])
+        self.assertEqual(CSRGraph.from_graph(g).bfs(1,6,csr_stats), [1,3,7,6])
+        self.assertEqual((stats.expanded, csr_stats.expanded), (6, 6)) # dst n'est pas étendu
+        self.assertEqual(traced, [2,4,7])
+        self.assertEqual(csr_traced, [2,4,7])
+
+    def test_bidir(self):
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid1.in")
+        traced = []
+        result = s.get_solution_bidir_stats(grid,callback=lambda *args: traced.append(args),sample=3)
+        stats = result.stats
+        self.assertEqual(result.swap_list, Solver().get_solution_bidir(grid))
+        self.assertEqual(stats.expanded, s.nodes_expanded)
+        self.assertEqual(stats.generated, stats.expanded*10) # 10 swaps possibles dans une grid 4*2
+        self.assertEqual(len(traced), stats.expanded//3)
+        self.assertGreater(stats.time_total, 0)
+
+    def test_implicit_bfs(self): # Sur l'arbre complet, chaque état est étendu une fois
+        g = Graph([])
+        grid = Grid.grid_from_file("input/grid0.in")
+        src, dst = grid.path_to_do()
+        stats = SearchStats()
+        self.assertNotEqual(g.bfs_generate_graph(src,dst,2,2,stats), [])
+        self.assertGreater(stats.expanded, 0)
+        stats = SearchStats()
+        ImplicitBFS(2,2).run(0,stats=stats)
+        self.assertEqual((stats.expanded, stats.generated), (24, 24*4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import sys
 sys.path.append("swap_puzzle/")
 
 import unittest 
+import random
 from solver import Solver
 from grid import Grid
 from graph import Graph
@@ -90,9 +91,30 @@ class Test_Solver(unittest.TestCase): # La sol naïve fait aussi les swaps d'ell
         self.assertEqual(g2.state, [[1,2,3,4],[5,6,7,8],[9,10,11,12],[13,14,15,16]])
 
 
+    def test_constructive(self): # Mêmes grids triées, jamais plus de swaps que la méthode naïve
+        s = Solver()
+        for i in range(5):
+            grid = Grid.grid_from_file("input/grid%d.in" % i)
+            g2 = grid.copy()
+            lis = s.get_sol_constructive(grid)
+            self.assertEqual(grid.is_sorted(), True)
+            self.assertLessEqual(len(lis), len(s.get_sol_naive(g2.copy())))
+            g2.swap_seq(lis)
+            self.assertEqual(g2.is_sorted(), True)
+
+    def test_constructive_large(self): # Grid 100*100 mélangée : les swaps sont légaux et trient la grid
+        random.seed(0)
+        l = list(range(1,10001))
+        random.shuffle(l)
+        grid = Grid(100,100,[l[i*100:(i+1)*100] for i in range(100)])
+        g2 = grid.copy()
+        lis = Solver().get_sol_constructive(grid)
+        g2.swap_seq(lis)
+        self.assertEqual((grid.is_sorted(), g2.is_sorted()), (True, True))
+
     ''' 
     
-    Test du bfs naïf sur les grids en exemple, pas de bench pour des tailles 3*3+ car ça devient très très long
+    Test du bfs naïf sur les grids en exemple, le graphe des états n'est plus construit donc les grids 3*3 passent
     
     '''
 
@@ -108,7 +130,7 @@ class Test_Solver(unittest.TestCase): # La sol naïve fait aussi les swaps d'ell
         grid.swap_seq(swap_list)
         self.assertEqual(grid.state,[[1,2],[3,4]])
 
-    '''def test_g1_bfs_naif(self):
+    def test_g1_bfs_naif(self):
         s = Solver()
         g = Graph([])
         grid = Grid.grid_from_file("input/grid1.in")
@@ -117,9 +139,9 @@ class Test_Solver(unittest.TestCase): # La sol naïve fait aussi les swaps d'ell
         path = g.get_path(src,dst,prev)
         swap_list = g.path_to_swap(path,4,2)
         grid.swap_seq(swap_list)
-        self.assertEqual(grid.state,[[1,2],[3,4],[5,6],[7,8]])'''
+        self.assertEqual(grid.state,[[1,2],[3,4],[5,6],[7,8]])
 
-    '''def test_g2_bfs_naif(self):
+    def test_g2_bfs_naif(self):
         s = Solver()
         g = Graph([])
         grid = Grid.grid_from_file("input/grid2.in")
@@ -128,7 +150,7 @@ class Test_Solver(unittest.TestCase): # La sol naïve fait aussi les swaps d'ell
         path = g.get_path(src,dst,prev)
         swap_list = g.path_to_swap(path,3,3)
         grid.swap_seq(swap_list)
-        self.assertEqual(grid.state,[[1,2,3],[4,5,6],[7,8,9]])'''
+        self.assertEqual(grid.state,[[1,2,3],[4,5,6],[7,8,9]])
 
     ''' 
     
@@ -248,5 +270,119 @@ class Test_Solver(unittest.TestCase): # La sol naïve fait aussi les swaps d'ell
         grid.swap_seq(swap_list)
         self.assertEqual(grid.state,[[1,2,3],[4,5,6],[7,8,9],[10,11,12]])
 
+    def test_a_star_moves(self): # Les indices des swaps enregistrés pendant la recherche donnent les swaps du chemin
+        g = Graph([])
+        grid = Grid.grid_from_file("input/grid4.in")
+        src, dst = grid.path_to_do()
+        h = heuristics.IncrementalHeuristic(4,4)
+        moves = g.bfs_a_star(src,dst,4,4,h,moves=True)
+        self.assertEqual(list(g.iter_swaps(moves,4,4)), g.path_to_swap(g.bfs_a_star(src,dst,4,4,h),4,4))
+
+    def test_iter_solution(self): # Le générateur donne les swaps un par un, on peut les appliquer au fur et à mesure
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid4.in")
+        count = 0
+        for swap in s.iter_solution(grid,heuristics.IncrementalHeuristic(4,4)):
+            grid.swap(*swap)
+            count += 1
+        self.assertEqual((grid.is_sorted(), count), (True, 14))
+
+    ''' 
+    
+    Test du bfs bidirectionnel, exact et sans heuristique
+    
+    '''
+
+    def test_g2_bidir(self):
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid2.in")
+        swap_list = s.get_solution_bidir(grid)
+        grid.swap_seq(swap_list)
+        self.assertEqual((grid.state, len(swap_list)), ([[1,2,3],[4,5,6],[7,8,9]], 4))
+
+    def test_g1_bidir(self):
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid1.in")
+        swap_list = s.get_solution_bidir(grid)
+        self.assertEqual(swap_list, [((3,0),(3,1))])
+
+    def test_bidir_optimal(self): # Comparaison avec un bfs complet sur la grid 2*3 (720 états)
+        s = Solver()
+        g = Graph([])
+        for _ in range(5):
+            grid = Grid(2,3)
+            grid.generate_grid(3)
+            src, dst = grid.path_to_do()
+            prev = g.bfs_generate_graph(src,dst,2,3)
+            path = g.get_path(src,dst,prev) if src != dst else [src]
+            swap_list = s.get_solution_bidir(grid.copy())
+            self.assertEqual(len(swap_list), len(path)-1)
+            grid.swap_seq(swap_list)
+            self.assertEqual(grid.is_sorted(), True)
+
+    ''' 
+    
+    Test de l'IDA*, mémoire linéaire en la profondeur
+    
+    '''
+
+    def test_g4_ida(self): # Même longueur que le A* avec une heuristique admissible
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid4.in")
+        swap_list = s.get_solution_ida(grid,heuristics.IncrementalHeuristic(4,4))
+        self.assertEqual(grid.state, Grid.grid_from_file("input/grid4.in").state) # La grid n'est pas modifiée
+        grid.swap_seq(swap_list)
+        self.assertEqual((grid.is_sorted(), len(swap_list)), (True, 14))
+
+    def test_g2_ida_tt(self):
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid2.in")
+        swap_list = s.get_solution_ida(grid,heuristics.manhattan_distance,tt_size=1000)
+        grid.swap_seq(swap_list)
+        self.assertEqual(grid.state,[[1,2,3],[4,5,6],[7,8,9]])
+
+    def test_beam(self): # Plus court que la méthode constructive sur une grid 6*6 mélangée, et la grid n'est pas modifiée
+        random.seed(1)
+        l = list(range(1,37))
+        random.shuffle(l)
+        grid = Grid(6,6,[l[i*6:(i+1)*6] for i in range(6)])
+        swap_list = Solver().get_solution_beam(grid,30)
+        self.assertLess(len(swap_list), len(Solver().get_sol_constructive(grid.copy())))
+        grid.swap_seq(swap_list)
+        self.assertEqual(grid.is_sorted(), True)
+
+    def test_beam_budget(self): # Budget épuisé : on termine avec la méthode constructive
+        grid = Grid.grid_from_file("input/grid4.in")
+        swap_list = Solver().get_solution_beam(grid,10,max_depth=3)
+        grid.swap_seq(swap_list)
+        self.assertEqual(grid.is_sorted(), True)
+        self.assertEqual(Solver().get_solution_beam(grid), [])
+
+    ''' 
+    
+    Test de l'A* "anytime" : solutions de plus en plus courtes avec une garantie sur leur longueur
+    
+    '''
+
+    def test_g4_anytime(self): # Sans budget on finit par prouver l'optimalité
+        s = Solver()
+        grid = Grid.grid_from_file("input/grid4.in")
+        swap_list, bound = s.get_solution_anytime(grid,heuristics.IncrementalHeuristic(4,4))
+        self.assertEqual((len(swap_list), bound), (14, 1.))
+        grid.swap_seq(swap_list)
+        self.assertEqual(grid.is_sorted(), True)
+
+    def test_anytime_budget(self): # Avec un budget, la garantie reste vraie (solution optimale en 23 swaps)
+        s = Solver()
+        l = [5,12,11,14,13,4,7,1,2,16,15,6,3,9,10,8]
+        grid = Grid(4,4,[l[i*4:(i+1)*4] for i in range(4)])
+        swap_list, bound = s.get_solution_anytime(grid,heuristics.IncrementalHeuristic(4,4),node_budget=100)
+        self.assertLessEqual(s.nodes_expanded, 100)
+        self.assertGreater(bound, 1.)
+        self.assertLessEqual(len(swap_list), bound*23)
+        grid.swap_seq(swap_list)
+        self.assertEqual(grid.is_sorted(), True)
+        self.assertEqual(s.get_solution_anytime(grid,heuristics.manhattan_distance,node_budget=0), ([], 1.))
+
 if __name__ == '__main__':
     unittest.main()  
\ No newline at end of file
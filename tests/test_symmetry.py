@@ -0,0 +1,63 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import random
+from symmetry import get_symmetries
+from distance_table import DistanceTable
+from pattern_database import PatternDatabase
+from cache import SolutionCache
+from codec import get_codec
+from grid import Grid
+from solver import Solver
+
+class Test_Symmetries(unittest.TestCase):
+    def test_distances(self): # Un état et ses images sont à la même distance de la grid triée (toutes les grids 2*2 et 2*3)
+        for m, n, order in [(2,2,4), (2,3,2)]:
+            table = DistanceTable.build(m,n)
+            sym = get_symmetries(m,n)
+            self.assertEqual(len(sym.perms), order)
+            for r in range(table.codec.nb_states):
+                l = table.codec.decode(r)
+                for t in range(order):
+                    self.assertEqual(table.dist[table.codec.encode(sym.transform(l,t))], table.dist[r])
+
+    def test_map_moves(self): # Les swaps d'une solution de l'image, transportés, trient l'état de départ
+        sym = get_symmetries(2,3)
+        codec = get_codec(2,3)
+        random.seed(2)
+        for _ in range(10):
+            l = random.sample(range(1,7),6)
+            key, t = sym.canonical(codec,codec.encode(l))
+            grid = Grid(2,3,[sym.transform(l,t)[:3],sym.transform(l,t)[3:]])
+            moves = [codec.swap_index[swap] for swap in Solver().get_solution_bidir(grid)]
+            grid = Grid(2,3,[l[:3],l[3:]])
+            grid.swap_seq([codec.swaps[k] for k in sym.map_moves(moves,t)])
+            self.assertEqual(grid.is_sorted(), True)
+
+    def test_cache(self): # Une grid et son image par la rotation partagent leurs entrées
+        codec = get_codec(3,3,"packed")
+        sym = get_symmetries(3,3)
+        grid = Grid(3,3,[[9,8,7],[6,5,4],[3,2,1]])
+        grid.swap((0,0),(1,0))
+        l = grid.flatten()
+        cache = SolutionCache()
+        moves = [codec.swap_index[swap] for swap in Solver().get_solution_bidir(grid)]
+        cache.put_solution(codec,codec.encode(l),moves)
+        image = sym.transform(l,1)
+        moves2 = cache.get_solution(codec,codec.encode(image))
+        self.assertEqual(moves2, sym.map_moves(moves,1))
+        grid = Grid(3,3,[image[:3],image[3:6],image[6:]])
+        grid.swap_seq([codec.swaps[k] for k in moves2])
+        self.assertEqual(grid.is_sorted(), True)
+
+    def test_pattern_database(self): # Les tables partagées donnent les mêmes valeurs que les tables calculées
+        pdb, full = PatternDatabase(2,4), PatternDatabase(2,4,symmetric=False)
+        self.assertEqual(([m is None for m in pdb.mirrors], pdb.tables[1] is pdb.tables[0]), ([True, False], True))
+        codec = get_codec(2,4,"rank")
+        for r in range(0, codec.nb_states, 7):
+            self.assertEqual(pdb.value(codec.decode(r)), full.value(codec.decode(r)))
+
+if __name__ == '__main__':
+    unittest.main()